@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Compare JSON decoding backends on the bundled examples and synthetic documents
+
+Usage:
+    python benchmarks/decoding_benchmark.py
+    python benchmarks/decoding_benchmark.py --products 200000 --repeat 5
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from schema_visualizer.decoding import JsonDecoder, available_backends  # noqa: E402
+
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples')
+
+
+def synthetic_graph(products: int) -> dict:
+    """Build a wide @graph document resembling a large site export"""
+    return {
+        "@context": "https://schema.org",
+        "@graph": [
+            {
+                "@type": "Product",
+                "@id": f"https://example.com/products/{i}#product",
+                "name": f"Product {i}",
+                "description": "A synthetic product used for decoding benchmarks. " * 3,
+                "sku": f"SKU-{i:08d}",
+                "offers": {
+                    "@type": "Offer",
+                    "price": round(i * 0.37, 2),
+                    "priceCurrency": "USD",
+                    "availability": "https://schema.org/InStock"
+                },
+                "aggregateRating": {"@type": "AggregateRating", "ratingValue": 4.5, "reviewCount": i % 500}
+            }
+            for i in range(products)
+        ]
+    }
+
+
+def synthetic_deep(depth: int) -> dict:
+    """Build a deeply nested document"""
+    data = {"@type": "Thing", "name": "leaf"}
+    for level in range(depth):
+        data = {"@type": "ListItem", "position": level, "item": data}
+    return data
+
+
+def best_time(func, repeat: int) -> float:
+    """Return the fastest of several runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_file(label: str, path: str, backends, repeat: int):
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    # Baseline: the pre-decoder code path (read text, then json.loads the str)
+    def baseline():
+        with open(path, 'r', encoding='utf-8') as f:
+            json.loads(f.read())
+
+    results = [("json (str)", best_time(baseline, repeat))]
+    for name in backends:
+        decoder = JsonDecoder(name)
+        results.append((f"{name} (bytes)", best_time(lambda: decoder.loads(raw), repeat)))
+        results.append((f"{name} (file)", best_time(lambda: decoder.load_file(path), repeat)))
+
+    baseline_time = results[0][1]
+    print(f"\n{label} ({size / 1024:.1f} KB)")
+    for name, seconds in results:
+        throughput = size / seconds / (1024 * 1024) if seconds else float('inf')
+        speedup = baseline_time / seconds if seconds else float('inf')
+        print(f"   {name:<18} {seconds * 1000:10.3f} ms  {throughput:8.1f} MB/s  {speedup:5.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON decoding backends")
+    parser.add_argument('--products', type=int, default=50000,
+                        help='Entities in the synthetic @graph document (default: 50000)')
+    parser.add_argument('--depth', type=int, default=500,
+                        help='Nesting depth of the synthetic deep document (default: 500)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (default: 5)')
+    args = parser.parse_args()
+
+    backends = available_backends()
+    print(f"Installed backends: {', '.join(backends)}")
+
+    for path in sorted(glob.glob(os.path.join(EXAMPLES_DIR, '*.json'))):
+        bench_file(os.path.basename(path), path, backends, args.repeat * 20)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        synthetic = {
+            f"synthetic @graph, {args.products} products": synthetic_graph(args.products),
+            f"synthetic nesting, depth {args.depth}": synthetic_deep(args.depth),
+        }
+        for label, document in synthetic.items():
+            path = os.path.join(tmp_dir, 'document.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(document, f)
+            bench_file(label, path, backends, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
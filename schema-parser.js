@@ -352,6 +352,180 @@ class SchemaParser {
     }
 }
 
+// Graph artifacts exported by the Python tool (export_json / --export-json)
+const GRAPH_ARTIFACT_FORMAT = 'schema-visualizer-graph';
+const ARTIFACT_CHUNK_SIZE = 5000;
+const ARTIFACT_MARKER = /^\s*\{\s*"format"\s*:\s*"schema-visualizer-graph"/;
+
+// Check the start of a text for the artifact marker (written first by Python)
+function isGraphArtifact(text) {
+    return ARTIFACT_MARKER.test(text.slice(0, 256));
+}
+
+// Decode a graph artifact and send vis.js-ready nodes and edges back in chunks.
+// Runs inside a Web Worker; falls back to the main thread if workers are blocked.
+function graphArtifactWorker(scope) {
+    scope.onmessage = async function(event) {
+        const { blob, chunkSize, format } = event.data;
+
+        try {
+            const artifact = JSON.parse(await blob.text());
+            if (!artifact || artifact.format !== format) {
+                throw new Error('Not a Schema Visualizer graph artifact');
+            }
+
+            const nodes = artifact.nodes || [];
+            const edges = artifact.edges || [];
+            const typeNodes = nodes.filter(node => node.type === 'type').length;
+
+            scope.postMessage({
+                kind: 'meta',
+                positions: Boolean(artifact.positions),
+                stats: {
+                    totalNodes: nodes.length,
+                    typeNodes: typeNodes,
+                    propertyNodes: nodes.length - typeNodes,
+                    totalEdges: edges.length
+                }
+            });
+
+            for (let i = 0; i < nodes.length; i += chunkSize) {
+                scope.postMessage({
+                    kind: 'nodes',
+                    items: nodes.slice(i, i + chunkSize).map(node => ({
+                        id: node.id,
+                        label: node.label,
+                        title: node.title,
+                        color: node.color,
+                        size: node.size,
+                        x: node.x,
+                        y: node.y
+                    }))
+                });
+            }
+
+            for (let i = 0; i < edges.length; i += chunkSize) {
+                scope.postMessage({
+                    kind: 'edges',
+                    items: edges.slice(i, i + chunkSize).map(edge => ({
+                        from: edge.source,
+                        to: edge.target
+                    }))
+                });
+            }
+
+            scope.postMessage({ kind: 'done' });
+        } catch (error) {
+            scope.postMessage({ kind: 'error', message: `Invalid graph artifact: ${error.message}` });
+        }
+    };
+}
+
+// Load a precomputed graph artifact without re-parsing or re-laying it out
+function loadGraphArtifact(blob, name) {
+    const container = document.getElementById('network-container');
+    const emptyState = document.getElementById('empty-state');
+    if (emptyState) {
+        emptyState.style.display = 'none';
+    }
+
+    const isDarkMode = document.documentElement.classList.contains('dark');
+    const edgeColor = isDarkMode ? '#e2e8f0' : '#1e293b';
+    const fontColor = isDarkMode ? '#e2e8f0' : '#1e293b';
+
+    const nodes = new vis.DataSet();
+    const edges = new vis.DataSet();
+    let stats = null;
+    let worker = null;
+    let workerUrl = null;
+
+    function stopWorker() {
+        if (worker) {
+            worker.terminate();
+            worker = null;
+        }
+        if (workerUrl) {
+            URL.revokeObjectURL(workerUrl);
+            workerUrl = null;
+        }
+    }
+
+    showMessage(`Loading graph "${name}"...`, 'info');
+
+    function handleMessage(message) {
+        if (message.kind === 'meta') {
+            stats = message.stats;
+
+            if (network) {
+                network.destroy();
+            }
+
+            // Precomputed positions make physics and vis.js' own layout unnecessary
+            network = new vis.Network(container, { nodes: nodes, edges: edges }, {
+                physics: { enabled: !message.positions },
+                layout: { improvedLayout: false },
+                interaction: {
+                    hover: true,
+                    tooltipDelay: 100,
+                    zoomView: true,
+                    dragView: true,
+                    hideEdgesOnDrag: true
+                }
+            });
+        } else if (message.kind === 'nodes') {
+            message.items.forEach(node => {
+                node.font = { color: fontColor, size: 12, face: 'Inter, sans-serif' };
+                node.shape = 'dot';
+            });
+            nodes.add(message.items);
+        } else if (message.kind === 'edges') {
+            message.items.forEach(edge => {
+                edge.color = edgeColor;
+                edge.width = 1;
+                edge.arrows = 'to';
+            });
+            edges.add(message.items);
+        } else if (message.kind === 'done') {
+            stopWorker();
+            network.fit();
+            showStatistics(stats);
+            document.getElementById('messages').innerHTML = '';
+            document.getElementById('details-panel').style.display = 'block';
+            showMessage(`Graph "${name}" loaded: ${stats.totalNodes} nodes`, 'success');
+        } else if (message.kind === 'error') {
+            stopWorker();
+            showMessage(message.message, 'error');
+        }
+    }
+
+    const request = { blob: blob, chunkSize: ARTIFACT_CHUNK_SIZE, format: GRAPH_ARTIFACT_FORMAT };
+
+    // Some browsers block workers on file:// pages; decode here instead
+    function decodeOnMainThread(error) {
+        console.warn('Web Worker unavailable, decoding graph on the main thread:', error);
+        stopWorker();
+        const scope = { postMessage: handleMessage };
+        graphArtifactWorker(scope);
+        scope.onmessage({ data: request });
+    }
+
+    try {
+        const source = `(${graphArtifactWorker.toString()})(self);`;
+        workerUrl = URL.createObjectURL(new Blob([source], { type: 'application/javascript' }));
+        worker = new Worker(workerUrl);
+        worker.onmessage = event => handleMessage(event.data);
+        worker.onerror = event => {
+            if (stats === null) {
+                event.preventDefault();
+                decodeOnMainThread(event.message);
+            }
+        };
+        worker.postMessage(request);
+    } catch (error) {
+        decodeOnMainThread(error);
+    }
+}
+
 // Visualize the schema
 function visualizeSchema() {
     const input = document.getElementById('schema-input').value.trim();
@@ -362,6 +536,11 @@ function visualizeSchema() {
         return;
     }
 
+    if (isGraphArtifact(input)) {
+        loadGraphArtifact(new Blob([input]), 'pasted graph');
+        return;
+    }
+
     let parser, result, validation;
 
     if (isGenericMode) {
@@ -705,6 +884,18 @@ function handleFileUpload(event) {
     const file = event.target.files[0];
     if (!file) return;
 
+    // Precomputed graph artifacts skip the text box and open directly
+    file.slice(0, 256).text().then(head => {
+        if (isGraphArtifact(head)) {
+            loadGraphArtifact(file, file.name);
+        } else {
+            readSchemaFile(file);
+        }
+    }, () => readSchemaFile(file));
+}
+
+// Read a schema file into the input box
+function readSchemaFile(file) {
     const reader = new FileReader();
     reader.onload = function(e) {
         const content = e.target.result;
@@ -9,14 +9,26 @@ Usage:
     python schema_visualizer.py input.json --layout hierarchical --theme light
     python schema_visualizer.py input.json --export-json graph.json
     python schema_visualizer.py --stdin  (read from stdin)
+    python schema_visualizer.py input.json --store crawl.db --source-url https://example.com/
+    python schema_visualizer.py https://example.com/ --from-store crawl.db
+    python schema_visualizer.py --pipeline schemas/ crawl.tar.gz --output-dir out/
+    python schema_visualizer.py site-export.jsonl --shards 8
+    python schema_visualizer.py --pipeline schemas/ --thumbnails svg --no-html
 
 Author: MapPackSEO Toolbox
 """
 
 import argparse
+import sqlite3
 import sys
 import os
-from schema_visualizer import SchemaParser, SchemaVisualizer, VisualizerConfig
+from schema_visualizer import (
+    SchemaParser, SchemaVisualizer, VisualizerConfig, IngestionPipeline, GraphStore, GraphBudget,
+    ShardedSchemaParser
+)
+from schema_visualizer.budget import parse_size
+from schema_visualizer.decoding import JsonDecoder, BACKEND_PREFERENCE
+from schema_visualizer.thumbnail import ThumbnailRenderer, THUMBNAIL_FORMATS, check_format
 
 
 def print_banner():
@@ -39,6 +51,205 @@ def print_statistics(stats):
     print(f"   Total Edges: {stats['total_edges']}")
 
 
+def print_degradation(report, stage):
+    """Print what a budget simplified, if anything"""
+    if not report.degraded:
+        return
+    print(f"\n⚠️  Budget reached while {stage} - output was simplified:")
+    for line in report.summary():
+        print(f"   - {line}")
+
+
+def build_budget(args):
+    """Create a GraphBudget from --max-nodes/--max-memory, or None"""
+    if not args.max_nodes and not args.max_memory:
+        return None
+    return GraphBudget(max_nodes=args.max_nodes, max_memory=args.max_memory)
+
+
+def build_decoder(args):
+    """Create the --json-backend decoder, exiting if it is not installed"""
+    try:
+        return JsonDecoder(args.json_backend)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+def run_pipeline(args):
+    """Run batch mode over the --pipeline sources"""
+    build_decoder(args)
+
+    if not args.quiet:
+        print(f"🚚 Processing {len(args.pipeline)} source(s) into: {args.output_dir}")
+
+    try:
+        pipeline = IngestionPipeline(
+            output_dir=args.output_dir,
+            layout=args.layout,
+            theme=args.theme,
+            assets_dir=args.assets_dir,
+            export_json=args.export_graphs,
+            export_layout=args.with_layout,
+            thumbnails=args.thumbnails,
+            html=not args.no_html,
+            workers=args.workers,
+            queue_size=args.queue_size,
+            max_nodes=args.max_nodes,
+            max_memory=args.max_memory,
+            json_backend=args.json_backend,
+            quiet=args.quiet
+        )
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    metrics = pipeline.run(args.pipeline)
+
+    for name, stages in metrics['degradations']:
+        for stage, lines in stages.items():
+            print(f"⚠️  {name}: budget reached while {stage} - output was simplified:")
+            for line in lines:
+                print(f"   - {line}")
+
+    for name, error in metrics['errors']:
+        print(f"❌ {name}: {error}")
+
+    if not args.quiet:
+        print(f"\n✅ Rendered {metrics['processed']} document(s), {metrics['failed']} failed")
+        print(f"   Throughput: {metrics['docs_per_second']:.1f} docs/s, "
+              f"max queue depth {metrics['max_queue_depth']}")
+        if metrics['unchanged']:
+            print(f"   Unchanged files (not rewritten): {metrics['unchanged']}")
+        print("\n✨ Done!\n")
+
+    if metrics['failed']:
+        sys.exit(1)
+
+
+def write_thumbnail(args, nodes, edges):
+    """Write the --thumbnail preview image"""
+    renderer = ThumbnailRenderer(layout=args.layout, theme=args.theme, budget=build_budget(args))
+
+    try:
+        written = renderer.save(nodes, edges, args.thumbnail)
+    except Exception as e:
+        print(f"❌ Error writing thumbnail: {e}")
+        return
+
+    if not args.quiet:
+        if written:
+            print(f"✅ Thumbnail written to: {args.thumbnail}")
+        else:
+            print(f"✅ Thumbnail unchanged: {args.thumbnail}")
+
+
+def parse_input(args):
+    """Read and parse the input schema, storing it if --store is given"""
+    budget = build_budget(args)
+
+    # Read input
+    try:
+        if args.stdin:
+            if not args.quiet:
+                print("📖 Reading schema from stdin...")
+            schema_input = sys.stdin.buffer.read()
+        else:
+            if not args.quiet:
+                print(f"📖 Reading schema from: {args.input}")
+
+            if not os.path.exists(args.input):
+                print(f"❌ Error: File not found: {args.input}")
+                sys.exit(1)
+
+            # The parser decodes the file straight from a memory map
+            schema_input = args.input
+
+    except Exception as e:
+        print(f"❌ Error reading input: {e}")
+        sys.exit(1)
+
+    # Parse schema
+    if not args.quiet:
+        print("🔍 Parsing schema...")
+
+    if args.shards:
+        # Budgets still apply when rendering, but not while parsing shards
+        parser_obj = ShardedSchemaParser(workers=args.shards, decoder=build_decoder(args))
+    else:
+        parser_obj = SchemaParser(budget=budget, decoder=build_decoder(args))
+    result = parser_obj.parse(schema_input)
+
+    if not result.get('valid', False):
+        print(f"❌ Error: {result.get('error', 'Unknown parsing error')}")
+        sys.exit(1)
+
+    nodes = result['nodes']
+    edges = result['edges']
+
+    if not args.quiet:
+        print(f"✅ Successfully parsed schema")
+        stats = parser_obj.get_statistics()
+        print_statistics(stats)
+        print_degradation(parser_obj.report, "parsing")
+
+    # Validate if requested
+    if args.validate and not args.quiet:
+        schema_data = parser_obj.load(schema_input)
+        validation = parser_obj.validate_schema(schema_data)
+
+        if validation['errors']:
+            print("\n⚠️  Validation Errors:")
+            for error in validation['errors']:
+                print(f"   - {error}")
+
+        if validation['warnings']:
+            print("\n⚠️  Validation Warnings:")
+            for warning in validation['warnings']:
+                print(f"   - {warning}")
+
+    # Persist the parsed graph if requested
+    if args.store:
+        source = args.source_url or ('stdin' if args.stdin else args.input)
+        try:
+            with GraphStore(args.store) as store:
+                document_id = store.add_graph(nodes, edges, source)
+        except sqlite3.Error as e:
+            print(f"❌ Error storing graph: {e}")
+            sys.exit(1)
+        if not args.quiet:
+            print(f"\n💾 Stored graph as document {document_id} in: {args.store}")
+
+    return nodes, edges
+
+
+def load_from_store(args):
+    """Load the latest stored graph for the input source from --from-store"""
+    if not args.quiet:
+        print(f"📖 Loading stored graph for: {args.input}")
+
+    try:
+        with GraphStore(args.from_store) as store:
+            document_id = store.latest_document(args.input)
+            result = store.load_graph(document_id) if document_id is not None else None
+    except sqlite3.Error as e:
+        print(f"❌ Error reading graph store: {e}")
+        sys.exit(1)
+
+    if document_id is None:
+        print(f"❌ Error: No stored graph for: {args.input}")
+        sys.exit(1)
+
+    if not result.get('valid', False):
+        print(f"❌ Error: {result.get('error', 'Unknown store error')}")
+        sys.exit(1)
+
+    if not args.quiet:
+        print(f"✅ Loaded document {document_id}: "
+              f"{len(result['nodes'])} nodes, {len(result['edges'])} edges")
+
+    return result['nodes'], result['edges']
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Visualize Schema.org markup as interactive graphs",
@@ -49,7 +260,9 @@ Examples:
   %(prog)s schema.json -o visualization.html
   %(prog)s schema.json --layout hierarchical --theme light
   %(prog)s schema.json --export-json data.json --no-open
+  %(prog)s schema.json -o out/page.html --assets-dir out/assets
   cat schema.json | %(prog)s --stdin
+  %(prog)s --pipeline schemas/ crawl.tar.gz http://localhost:8000/ --output-dir out/
 
 Available Layouts:
   force_directed  - Dynamic force-directed layout (default)
@@ -74,6 +287,12 @@ Available Themes:
         action='store_true',
         help='Read schema from stdin instead of file'
     )
+    parser.add_argument(
+        '--pipeline',
+        nargs='+',
+        metavar='SOURCE',
+        help='Batch mode: render every schema in these directories, tar/zip archives or HTTP URLs'
+    )
 
     # Output options
     parser.add_argument(
@@ -86,6 +305,57 @@ Available Themes:
         metavar='FILE',
         help='Export graph data as JSON to specified file'
     )
+    parser.add_argument(
+        '--with-layout',
+        action='store_true',
+        help='Precompute node positions in exported JSON so the web interface opens it instantly'
+    )
+    parser.add_argument(
+        '--assets-dir',
+        metavar='DIR',
+        help='Bundle vis-network and styles into a shared offline assets directory'
+    )
+    parser.add_argument(
+        '--thumbnail',
+        metavar='FILE',
+        help='Also write a static preview image; .svg, or .png if Pillow is installed'
+    )
+    parser.add_argument(
+        '--thumbnails',
+        choices=THUMBNAIL_FORMATS,
+        help='Also write a static preview image per document in --pipeline mode'
+    )
+    parser.add_argument(
+        '--no-html',
+        action='store_true',
+        help='Skip the interactive HTML page (e.g. when only thumbnails are needed)'
+    )
+
+    parser.add_argument(
+        '--store',
+        metavar='DB',
+        help='Save the parsed graph into a SQLite graph store'
+    )
+    parser.add_argument(
+        '--source-url',
+        metavar='URL',
+        help='Source URL recorded with --store (default: input path)'
+    )
+    parser.add_argument(
+        '--from-store',
+        metavar='DB',
+        help='Visualize the latest stored graph for the input source instead of parsing'
+    )
+    parser.add_argument(
+        '--output-dir',
+        default='schema_visualizations',
+        help='Output directory for --pipeline mode (default: schema_visualizations)'
+    )
+    parser.add_argument(
+        '--export-graphs',
+        action='store_true',
+        help='In --pipeline mode, also export <name>.graph.json for each document'
+    )
 
     # Visualization options
     parser.add_argument(
@@ -127,110 +397,137 @@ Available Themes:
         action='store_true',
         help='Validate schema and show warnings'
     )
+    parser.add_argument(
+        '--max-nodes',
+        type=int,
+        help='Node budget; larger schemas are simplified instead of failing'
+    )
+    parser.add_argument(
+        '--max-memory',
+        type=parse_size,
+        metavar='SIZE',
+        help='Memory budget such as 512M or 2G; oversized inputs are decoded incrementally'
+    )
+    parser.add_argument(
+        '--json-backend',
+        choices=('auto',) + BACKEND_PREFERENCE,
+        default='auto',
+        help='JSON decoding backend (default: auto, the fastest installed)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Worker processes for --pipeline mode (default: CPU count)'
+    )
+    parser.add_argument(
+        '--shards',
+        type=int,
+        metavar='N',
+        help='Parse one huge @graph or JSON Lines input file in N worker processes'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=64,
+        help='Documents buffered between readers and workers in --pipeline mode (default: 64)'
+    )
 
     args = parser.parse_args()
 
     # Validate input
-    if not args.stdin and not args.input:
-        parser.error("Either provide input file or use --stdin")
+    if not args.stdin and not args.input and not args.pipeline:
+        parser.error("Either provide input file or use --stdin or --pipeline")
 
-    if not args.quiet:
-        print_banner()
+    if args.shards and (args.stdin or args.pipeline or args.from_store):
+        parser.error("--shards needs an input file")
 
-    # Read input
-    try:
-        if args.stdin:
-            if not args.quiet:
-                print("📖 Reading schema from stdin...")
-            schema_input = sys.stdin.read()
-        else:
-            if not args.quiet:
-                print(f"📖 Reading schema from: {args.input}")
+    if args.thumbnail:
+        try:
+            check_format(os.path.splitext(args.thumbnail)[1].lstrip('.').lower())
+        except ValueError as e:
+            parser.error(str(e))
 
-            if not os.path.exists(args.input):
-                print(f"❌ Error: File not found: {args.input}")
-                sys.exit(1)
+    if args.from_store and not args.input:
+        parser.error("--from-store needs the stored source as input")
 
-            with open(args.input, 'r', encoding='utf-8') as f:
-                schema_input = f.read()
+    if args.with_layout and args.pipeline and not args.export_graphs:
+        parser.error("--with-layout in --pipeline mode needs --export-graphs")
 
-    except Exception as e:
-        print(f"❌ Error reading input: {e}")
-        sys.exit(1)
+    if args.with_layout and not args.pipeline and not args.export_json:
+        parser.error("--with-layout needs --export-json")
 
-    # Parse schema
-    if not args.quiet:
-        print("🔍 Parsing schema...")
+    if args.thumbnails and not args.pipeline:
+        parser.error("--thumbnails is for --pipeline mode; use --thumbnail FILE for a single input")
 
-    parser_obj = SchemaParser()
-    result = parser_obj.parse(schema_input)
+    if args.no_html and args.pipeline and not (args.thumbnails or args.export_graphs):
+        parser.error("--no-html in --pipeline mode needs --thumbnails or --export-graphs")
 
-    if not result.get('valid', False):
-        print(f"❌ Error: {result.get('error', 'Unknown parsing error')}")
-        sys.exit(1)
-
-    nodes = result['nodes']
-    edges = result['edges']
+    if args.no_html and not args.pipeline and not (args.thumbnail or args.export_json or args.store):
+        parser.error("--no-html needs --thumbnail, --export-json or --store")
 
     if not args.quiet:
-        print(f"✅ Successfully parsed schema")
-        stats = parser_obj.get_statistics()
-        print_statistics(stats)
-
-    # Validate if requested
-    if args.validate and not args.quiet:
-        import json
-        schema_data = json.loads(schema_input)
-        validation = parser_obj.validate_schema(schema_data)
-
-        if validation['errors']:
-            print("\n⚠️  Validation Errors:")
-            for error in validation['errors']:
-                print(f"   - {error}")
+        print_banner()
 
-        if validation['warnings']:
-            print("\n⚠️  Validation Warnings:")
-            for warning in validation['warnings']:
-                print(f"   - {warning}")
+    if args.pipeline:
+        run_pipeline(args)
+        return
 
-    # Create visualization
-    if not args.quiet:
-        print(f"\n🎨 Creating visualization...")
-        print(f"   Layout: {args.layout}")
-        print(f"   Theme: {args.theme}")
+    if args.from_store:
+        nodes, edges = load_from_store(args)
+    else:
+        nodes, edges = parse_input(args)
 
     visualizer = SchemaVisualizer(
         layout=args.layout,
         theme=args.theme,
         width=args.width,
-        height=args.height
+        height=args.height,
+        assets_dir=args.assets_dir,
+        budget=build_budget(args)
     )
 
-    try:
-        output_file = visualizer.create_visualization(
-            nodes=nodes,
-            edges=edges,
-            output_file=args.output,
-            auto_open=not args.no_open
-        )
-
+    # Create visualization
+    if not args.no_html:
         if not args.quiet:
-            print(f"✅ Visualization created successfully!")
-            print(f"   File: {os.path.abspath(output_file)}")
+            print(f"\n🎨 Creating visualization...")
+            print(f"   Layout: {args.layout}")
+            print(f"   Theme: {args.theme}")
 
-    except Exception as e:
-        print(f"❌ Error creating visualization: {e}")
-        sys.exit(1)
+        try:
+            output_file = visualizer.create_visualization(
+                nodes=nodes,
+                edges=edges,
+                output_file=args.output,
+                auto_open=not args.no_open
+            )
+
+            if not args.quiet:
+                print_degradation(visualizer.report, "rendering")
+                if output_file in visualizer.unchanged:
+                    print(f"✅ Visualization unchanged, file not rewritten")
+                else:
+                    print(f"✅ Visualization created successfully!")
+                print(f"   File: {os.path.abspath(output_file)}")
+
+        except Exception as e:
+            print(f"❌ Error creating visualization: {e}")
+            sys.exit(1)
 
     # Export JSON if requested
     if args.export_json:
         try:
-            visualizer.export_json(nodes, edges, args.export_json)
-            if not args.quiet:
+            visualizer.export_json(nodes, edges, args.export_json, include_layout=args.with_layout)
+            if not args.quiet and args.export_json in visualizer.unchanged:
+                print(f"✅ Graph data unchanged: {args.export_json}")
+            elif not args.quiet:
                 print(f"✅ Graph data exported to: {args.export_json}")
         except Exception as e:
             print(f"❌ Error exporting JSON: {e}")
 
+    # Write thumbnail if requested
+    if args.thumbnail:
+        write_thumbnail(args, nodes, edges)
+
     if not args.quiet:
         print("\n✨ Done!\n")
 
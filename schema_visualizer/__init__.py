@@ -8,5 +8,13 @@ __author__ = "MapPackSEO Toolbox"
 from .parser import SchemaParser
 from .visualizer import SchemaVisualizer
 from .config import VisualizerConfig
+from .assets import AssetBundle
+from .pipeline import IngestionPipeline
+from .store import GraphStore
+from .budget import GraphBudget, DegradationReport
+from .sharding import ShardedSchemaParser
+from .thumbnail import ThumbnailRenderer
 
-__all__ = ['SchemaParser', 'SchemaVisualizer', 'VisualizerConfig']
+__all__ = ['SchemaParser', 'SchemaVisualizer', 'VisualizerConfig', 'AssetBundle', 'IngestionPipeline', 'GraphStore',
+           'GraphBudget', 'DegradationReport', 'ShardedSchemaParser',
+           'ThumbnailRenderer']
@@ -0,0 +1,164 @@
+"""
+Shared offline asset bundle for generated visualizations
+"""
+
+import glob
+import hashlib
+import os
+import re
+import shutil
+from typing import Dict, Optional
+
+
+# Tags in pyvis' local template that point at the vis-network build and lib/ bindings
+_VIS_SCRIPT_RE = re.compile(r'<script[^>]*src="[^"]*vis-network[^"]*\.js"[^>]*>\s*</script>')
+_VIS_STYLE_RE = re.compile(r'<link[^>]*href="[^"]*vis-network[^"]*\.css"[^>]*/?>')
+_UTILS_SCRIPT_RE = re.compile(r'<script[^>]*src="[^"]*bindings/utils\.js"[^>]*>\s*</script>')
+
+# Remaining CDN tags (bootstrap) cannot be vendored and would stall offline pages
+_REMOTE_SCRIPT_RE = re.compile(r'<script[^>]*src="https?://[^"]*"[^>]*>\s*</script>')
+_REMOTE_STYLE_RE = re.compile(r'<link[^>]*href="https?://[^"]*"[^>]*/?>')
+
+# Where pyvis' local template expects its bindings, relative to the page
+_PYVIS_UTILS = os.path.join("lib", "bindings", "utils.js")
+
+
+def copy_pyvis_lib(page_dir: str) -> str:
+    """
+    Copy the one pyvis script a page loads from lib/ next to the page
+
+    pyvis' local template only loads lib/bindings/utils.js (vis-network comes
+    from its CDN), so the rest of pyvis' lib/ is not copied. Existing files are
+    left alone; concurrent workers writing the same page directory each copy
+    through a temp file, so none of them sees a partial or conflicting file.
+
+    Returns:
+        Path of the copied script
+    """
+    target = os.path.join(page_dir, _PYVIS_UTILS)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        shutil.copyfile(os.path.join(AssetBundle._pyvis_lib_dir(), "bindings", "utils.js"), tmp_path)
+        os.replace(tmp_path, target)
+    return target
+
+
+class AssetBundle:
+    """Vendor vis-network and page styles once into a shared assets directory"""
+
+    def __init__(self, assets_dir: str):
+        """
+        Initialize asset bundle
+
+        Args:
+            assets_dir: Directory that holds the shared, content-hashed assets
+        """
+        self.assets_dir = assets_dir
+        self.files: Dict[str, str] = {}
+
+    def build(self, page_css: str) -> Dict[str, str]:
+        """
+        Write the bundled assets if they are not already present
+
+        Args:
+            page_css: Stylesheet injected into every generated page
+
+        Returns:
+            Mapping of asset role ('vis_js', 'vis_css', 'utils_js', 'page_css')
+            to absolute asset path
+        """
+        if self.files:
+            return self.files
+
+        os.makedirs(self.assets_dir, exist_ok=True)
+        lib_dir = self._pyvis_lib_dir()
+
+        sources = {
+            "vis_js": self._find(lib_dir, "vis-*/vis-network.min.js"),
+            "vis_css": self._find(lib_dir, "vis-*/vis-network.css"),
+            "utils_js": self._find(lib_dir, "bindings/utils.js"),
+        }
+
+        if sources["vis_js"] is None:
+            raise FileNotFoundError(f"vis-network library not found under {lib_dir}")
+
+        for role, source in sources.items():
+            if source is None:
+                continue
+            with open(source, 'rb') as f:
+                content = f.read()
+            self.files[role] = self._write_hashed(os.path.basename(source), content)
+
+        self.files["page_css"] = self._write_hashed(
+            "schema-visualizer.css", page_css.encode('utf-8')
+        )
+
+        return self.files
+
+    def rewrite_html(self, html_content: str, html_file: str) -> str:
+        """
+        Point a generated page at the shared assets instead of the CDN
+
+        Args:
+            html_content: HTML produced by pyvis
+            html_file: Path the page will be written to
+
+        Returns:
+            HTML referencing the bundled assets by relative URL
+        """
+        if not self.files:
+            raise RuntimeError("AssetBundle.build() must be called before rewrite_html()")
+
+        base_dir = os.path.dirname(os.path.abspath(html_file))
+
+        def href(role):
+            return os.path.relpath(self.files[role], base_dir).replace(os.sep, '/')
+
+        def script_tag(role):
+            return f'<script src="{href(role)}"></script>' if role in self.files else ''
+
+        def style_tag(role):
+            return f'<link rel="stylesheet" href="{href(role)}" />' if role in self.files else ''
+
+        html_content = _VIS_SCRIPT_RE.sub(lambda m: script_tag("vis_js"), html_content)
+        html_content = _VIS_STYLE_RE.sub(lambda m: style_tag("vis_css"), html_content)
+        html_content = _UTILS_SCRIPT_RE.sub(lambda m: script_tag("utils_js"), html_content)
+        html_content = _REMOTE_SCRIPT_RE.sub('', html_content)
+        html_content = _REMOTE_STYLE_RE.sub('', html_content)
+
+        return html_content
+
+    def page_style_tag(self, html_file: str) -> str:
+        """Get the <link> tag for the shared page stylesheet"""
+        base_dir = os.path.dirname(os.path.abspath(html_file))
+        href = os.path.relpath(self.files["page_css"], base_dir).replace(os.sep, '/')
+        return f'<link rel="stylesheet" href="{href}" />'
+
+    def _write_hashed(self, filename: str, content: bytes) -> str:
+        """Write content under a content-hashed name, skipping existing files"""
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        stem, ext = filename.split('.', 1) if '.' in filename else (filename, '')
+        hashed_name = f"{stem}.{digest}.{ext}" if ext else f"{stem}.{digest}"
+        target = os.path.abspath(os.path.join(self.assets_dir, hashed_name))
+
+        if not os.path.exists(target):
+            # Write to a temp file first so concurrent workers never see a partial asset
+            tmp_path = f"{target}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, target)
+
+        return target
+
+    @staticmethod
+    def _pyvis_lib_dir() -> str:
+        """Locate the JS/CSS library directory shipped with pyvis"""
+        import pyvis
+        return os.path.join(os.path.dirname(pyvis.__file__), "templates", "lib")
+
+    @staticmethod
+    def _find(lib_dir: str, pattern: str) -> Optional[str]:
+        """Find the newest file in the pyvis library directory matching pattern"""
+        matches = sorted(glob.glob(os.path.join(lib_dir, pattern)))
+        return matches[-1] if matches else None
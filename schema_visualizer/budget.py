@@ -0,0 +1,251 @@
+"""
+Node and memory budgets with graceful degradation for large schemas
+"""
+
+import os
+import re
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Degradation levels, cheapest representation last
+LEVEL_NORMAL = 0
+LEVEL_TRUNCATE_LABELS = 1
+LEVEL_DROP_LEAVES = 2
+LEVEL_STOP = 3
+
+# Fraction of the budget at which each level starts
+LEVEL_THRESHOLDS = (
+    (1.0, LEVEL_STOP),
+    (0.75, LEVEL_DROP_LEAVES),
+    (0.5, LEVEL_TRUNCATE_LABELS),
+)
+
+# Decoded JSON typically takes several times its file size in memory
+DECODE_EXPANSION = 8
+
+_SIZE_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*$', re.IGNORECASE)
+_SIZE_UNITS = {'': 1024 ** 2, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+def parse_size(value: str) -> int:
+    """
+    Parse a memory size such as '512M' or '2G' into bytes
+
+    Plain numbers are megabytes.
+    """
+    match = _SIZE_RE.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid memory size: {value}")
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit.upper()])
+
+
+def current_memory() -> Optional[int]:
+    """
+    Get the anonymous resident memory of this process in bytes, or None if unknown
+
+    File-backed pages, such as a memory-mapped input, are left out: the OS can
+    drop them at any time, so they do not count against a budget.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            fields = f.read().split()
+        # resident - shared (file-backed and shmem) pages
+        return (int(fields[1]) - int(fields[2])) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # Peak rather than current usage, but a safe upper bound
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class DegradationReport:
+    """Record of what was simplified to stay within a budget"""
+
+    def __init__(self):
+        self.reasons: List[str] = []
+        self.truncated_labels = 0
+        self.dropped_leaves = 0
+        self.clustered_items = 0
+        self.skipped_nodes = 0
+        self.dropped_edges = 0
+        self.streamed = False
+
+    @property
+    def degraded(self) -> bool:
+        return bool(
+            self.truncated_labels or self.dropped_leaves or self.clustered_items
+            or self.skipped_nodes or self.dropped_edges
+        )
+
+    def add_reason(self, reason: str):
+        if reason not in self.reasons:
+            self.reasons.append(reason)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "reasons": list(self.reasons),
+            "truncated_labels": self.truncated_labels,
+            "dropped_leaves": self.dropped_leaves,
+            "clustered_items": self.clustered_items,
+            "skipped_nodes": self.skipped_nodes,
+            "dropped_edges": self.dropped_edges,
+            "streamed": self.streamed
+        }
+
+    def summary(self) -> List[str]:
+        """Get human-readable lines describing the degradation"""
+        lines = list(self.reasons)
+        if self.streamed:
+            lines.append("Input decoded incrementally to limit memory")
+        if self.truncated_labels:
+            lines.append(f"Truncated {self.truncated_labels} labels")
+        if self.dropped_leaves:
+            lines.append(f"Dropped {self.dropped_leaves} leaf properties")
+        if self.clustered_items:
+            lines.append(f"Clustered {self.clustered_items} repeated siblings")
+        if self.skipped_nodes:
+            lines.append(f"Skipped {self.skipped_nodes} nodes after the budget was exhausted")
+        if self.dropped_edges:
+            lines.append(f"Dropped {self.dropped_edges} edges to omitted nodes")
+        return lines
+
+
+class GraphBudget:
+    """Node and memory limits enforced while parsing and rendering"""
+
+    def __init__(self, max_nodes: Optional[int] = None, max_memory: Optional[int] = None,
+                 label_length: int = 20, cluster_keep: int = 5, check_interval: int = 1000):
+        """
+        Initialize budget
+
+        Args:
+            max_nodes: Maximum number of graph nodes
+            max_memory: Maximum memory growth in bytes while parsing or
+                rendering, measured from start()
+            label_length: Label length once labels are truncated
+            cluster_keep: Array items kept before the rest are clustered
+            check_interval: Nodes between memory measurements
+        """
+        self.max_nodes = max_nodes
+        self.max_memory = max_memory
+        self.label_length = label_length
+        self.cluster_keep = cluster_keep
+        self.check_interval = check_interval
+        self._memory_level = LEVEL_NORMAL
+        self._checks = 0
+        self._baseline = 0
+        self.start()
+
+    def start(self):
+        """
+        Start measuring memory from the current usage
+
+        Called when parsing or rendering begins, so the interpreter, imported
+        libraries and earlier work do not count against the budget.
+        """
+        self._memory_level = LEVEL_NORMAL
+        self._checks = 0
+        if self.max_memory:
+            self._baseline = current_memory() or 0
+
+    def level(self, node_count: int, report: DegradationReport) -> int:
+        """
+        Get the degradation level for the current graph size
+
+        Memory is measured every check_interval calls; the most severe level
+        seen so far is kept, since memory is rarely returned to the OS.
+        """
+        level = LEVEL_NORMAL
+
+        if self.max_nodes:
+            level = self._level_for(node_count / self.max_nodes)
+            if level == LEVEL_STOP:
+                report.add_reason(f"Node budget of {self.max_nodes} reached")
+
+        if self.max_memory:
+            if self._checks % self.check_interval == 0:
+                memory = current_memory()
+                if memory is not None:
+                    growth = max(memory - self._baseline, 0)
+                    self._memory_level = max(
+                        self._memory_level, self._level_for(growth / self.max_memory)
+                    )
+                    if self._memory_level == LEVEL_STOP:
+                        report.add_reason(
+                            f"Memory budget of {self.max_memory // (1024 * 1024)} MB reached"
+                        )
+            self._checks += 1
+            level = max(level, self._memory_level)
+
+        return level
+
+    def should_stream(self, input_size: int) -> bool:
+        """Whether an input of this many bytes should be decoded incrementally"""
+        return bool(self.max_memory) and input_size * DECODE_EXPANSION > self.max_memory
+
+    def truncate(self, label: Any, report: DegradationReport) -> Any:
+        """Shorten a label to the degraded length"""
+        if isinstance(label, str) and len(label) > self.label_length:
+            report.truncated_labels += 1
+            return label[:self.label_length - 3] + "..."
+        return label
+
+    @staticmethod
+    def _level_for(ratio: float) -> int:
+        for threshold, level in LEVEL_THRESHOLDS:
+            if ratio >= threshold:
+                return level
+        return LEVEL_NORMAL
+
+
+def degrade_graph(nodes: List[Tuple], edges: List[Tuple], budget: GraphBudget,
+                  report: DegradationReport) -> Tuple[List[Tuple], List[Tuple]]:
+    """
+    Shrink an already-built graph to fit a node budget
+
+    Labels are truncated first, then leaf property nodes are dropped, and
+    finally nodes beyond the budget are cut. Edges to removed nodes are
+    dropped so the result is always a valid graph.
+
+    Returns:
+        Tuple of (nodes, edges)
+    """
+    if not budget.max_nodes or len(nodes) <= budget.max_nodes:
+        return nodes, edges
+
+    report.add_reason(f"Node budget of {budget.max_nodes} exceeded by input graph ({len(nodes)} nodes)")
+
+    nodes = [
+        node[:2] + (budget.truncate(node[2], report),) + node[3:]
+        for node in nodes
+    ]
+
+    if len(nodes) > budget.max_nodes:
+        has_children = {edge[0] for edge in edges}
+        excess = len(nodes) - budget.max_nodes
+        kept = []
+        for node in nodes:
+            if excess and node[0] == "property" and node[1] not in has_children:
+                excess -= 1
+                report.dropped_leaves += 1
+                continue
+            kept.append(node)
+        nodes = kept
+
+    if len(nodes) > budget.max_nodes:
+        report.skipped_nodes += len(nodes) - budget.max_nodes
+        nodes = nodes[:budget.max_nodes]
+
+    node_ids = {node[1] for node in nodes}
+    kept_edges = [edge for edge in edges if edge[0] in node_ids and edge[1] in node_ids]
+    report.dropped_edges += len(edges) - len(kept_edges)
+
+    return nodes, kept_edges
@@ -116,6 +116,55 @@ class VisualizerConfig:
         }
     }
 
+    # Page styling added around the generated graph
+    PAGE_STYLES = """
+body {
+    margin: 0;
+    padding: 0;
+    font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
+}
+.header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    padding: 20px;
+    text-align: center;
+    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+}
+.header h1 {
+    margin: 0;
+    font-size: 24px;
+    font-weight: 600;
+}
+.header p {
+    margin: 5px 0 0 0;
+    font-size: 14px;
+    opacity: 0.9;
+}
+.controls {
+    background: #f8f9fa;
+    padding: 10px 20px;
+    border-bottom: 1px solid #dee2e6;
+    font-size: 12px;
+    color: #495057;
+}
+#mynetwork {
+    width: 100%;
+    height: calc(100vh - 120px);
+}
+"""
+
+    PAGE_TITLE = "Schema Visualization - MapPackSEO Toolbox"
+
+    PAGE_HEADER = """
+<div class="header">
+    <h1>Schema Markup Visualizer</h1>
+    <p>Interactive visualization of Schema.org structured data</p>
+</div>
+<div class="controls">
+    Use mouse to drag nodes • Scroll to zoom • Click nodes for details
+</div>
+"""
+
     # Default settings
     DEFAULT_LAYOUT = "force_directed"
     DEFAULT_THEME = "dark"
@@ -141,3 +190,15 @@ class VisualizerConfig:
     def get_property_style(cls):
         """Get style for property nodes"""
         return cls.SCHEMA_TYPE_COLORS["property"]
+
+    @classmethod
+    def get_style_for_node(cls, node):
+        """Get color and size for a node tuple (type, id, label, schema_type)"""
+        node_kind = node[0]
+
+        if node_kind == "type" and len(node) > 3:
+            return cls.get_node_style(node[3])
+        elif node_kind == "property":
+            return cls.get_property_style()
+        else:
+            return cls.get_node_style("type")
@@ -0,0 +1,127 @@
+"""
+Pluggable JSON decoding backends with fast-path selection
+"""
+
+import json
+import mmap
+import os
+from typing import Any, Callable, Dict, List, Tuple
+
+# Preferred backends, fastest first; the standard library is always available
+BACKEND_PREFERENCE = ("orjson", "msgspec", "json")
+
+# Smaller files are cheaper to read than to map
+MMAP_THRESHOLD = 1024 * 1024
+
+_BOM = b'\xef\xbb\xbf'
+
+
+def _load_orjson() -> Tuple[Callable, Tuple]:
+    import orjson
+    return orjson.loads, (orjson.JSONDecodeError,)
+
+
+def _load_msgspec() -> Tuple[Callable, Tuple]:
+    import msgspec
+    return msgspec.json.decode, (msgspec.DecodeError,)
+
+
+def _stdlib_loads(data: Any) -> Any:
+    if isinstance(data, (memoryview, mmap.mmap)):
+        data = bytes(data)
+    return json.loads(data)
+
+
+_BACKEND_LOADERS = {
+    "orjson": _load_orjson,
+    "msgspec": _load_msgspec,
+    "json": lambda: (_stdlib_loads, (json.JSONDecodeError,)),
+}
+
+
+def available_backends() -> List[str]:
+    """Get the installed decoding backends, fastest first"""
+    backends = []
+    for name in BACKEND_PREFERENCE:
+        try:
+            _BACKEND_LOADERS[name]()
+        except ImportError:
+            continue
+        backends.append(name)
+    return backends
+
+
+class JsonDecoder:
+    """Decode JSON with the fastest installed backend"""
+
+    def __init__(self, backend: str = "auto"):
+        """
+        Initialize decoder
+
+        Args:
+            backend: 'orjson', 'msgspec', 'json', or 'auto' for the fastest
+                installed one
+
+        Raises:
+            ValueError: If the backend is unknown or not installed
+        """
+        if backend == "auto":
+            backend = available_backends()[0]
+
+        if backend not in _BACKEND_LOADERS:
+            raise ValueError(f"Unknown JSON backend: {backend}")
+
+        try:
+            self._decode, self._errors = _BACKEND_LOADERS[backend]()
+        except ImportError:
+            raise ValueError(f"JSON backend not installed: {backend}")
+
+        self.backend = backend
+
+    def loads(self, data: Any) -> Any:
+        """
+        Decode JSON from str, bytes, bytearray, memoryview or mmap
+
+        Errors are always raised as json.JSONDecodeError with the standard
+        library's message, whichever backend is in use. Note that orjson
+        decodes integers beyond 64 bits as floats.
+        """
+        if isinstance(data, (bytes, bytearray)) and data[:3] == _BOM:
+            data = data[3:]
+
+        try:
+            return self._decode(data)
+        except self._errors:
+            if self.backend == "json":
+                raise
+
+        # Fall back to the standard library: it accepts what stricter fast
+        # backends reject (e.g. integers over 64 bits, very deep nesting) and
+        # otherwise raises the canonical error message
+        return _stdlib_loads(data)
+
+    def load_file(self, path: str) -> Any:
+        """Decode a file from bytes (memory-mapped when large), without an intermediate str"""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+                return self.loads(f.read())
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                view = memoryview(buffer)
+                content = view[3:] if view[:3] == _BOM else view
+                try:
+                    return self.loads(content)
+                finally:
+                    # Views must be released before the map can close
+                    content.release()
+                    view.release()
+
+
+_default_decoders: Dict[str, JsonDecoder] = {}
+
+
+def get_decoder(backend: str = "auto") -> JsonDecoder:
+    """Get a shared decoder for a backend"""
+    if backend not in _default_decoders:
+        _default_decoders[backend] = JsonDecoder(backend)
+    return _default_decoders[backend]
@@ -0,0 +1,209 @@
+"""
+Pure-Python graph layouts matching the VisualizerConfig layout options
+"""
+
+import math
+import random
+from typing import Dict, List, Tuple
+
+from .config import VisualizerConfig
+
+Positions = Dict[str, Tuple[float, float]]
+
+
+def _adjacency(nodes: List[Tuple], edges: List[Tuple]) -> Tuple[List[str], Dict[str, List[str]], List[str]]:
+    """Get node IDs, children lists, and root nodes (no incoming edges)"""
+    node_ids = [node[1] for node in nodes]
+    known = set(node_ids)
+    children: Dict[str, List[str]] = {node_id: [] for node_id in node_ids}
+    has_parent = set()
+
+    for source, target in edges:
+        if source in known and target in known and target not in has_parent:
+            children[source].append(target)
+            has_parent.add(target)
+
+    roots = [node_id for node_id in node_ids if node_id not in has_parent]
+    return node_ids, children, roots
+
+
+def hierarchical_layout(nodes: List[Tuple], edges: List[Tuple]) -> Positions:
+    """
+    Tree layout: leaves spaced evenly, parents centred over their children
+
+    Uses the spacing of the 'hierarchical' entry in VisualizerConfig.LAYOUTS.
+    """
+    settings = VisualizerConfig.LAYOUTS["hierarchical"]["hierarchical"]
+    level_separation = settings["levelSeparation"]
+    node_spacing = settings["nodeSpacing"]
+    tree_spacing = settings["treeSpacing"]
+
+    node_ids, children, roots = _adjacency(nodes, edges)
+    positions: Positions = {}
+    next_x = 0.0
+    visited = set()
+
+    for root in roots + node_ids:
+        if root in visited:
+            continue
+
+        # Iterative post-order walk so deep schemas cannot hit the recursion limit
+        stack = [(root, 0, False)]
+        while stack:
+            node_id, depth, expanded = stack.pop()
+            if expanded:
+                kids = [kid for kid in children[node_id] if kid in positions]
+                if kids:
+                    x = sum(positions[kid][0] for kid in kids) / len(kids)
+                else:
+                    x = next_x
+                    next_x += node_spacing
+                positions[node_id] = (x, depth * level_separation)
+                continue
+
+            if node_id in visited:
+                continue
+            visited.add(node_id)
+            stack.append((node_id, depth, True))
+            for kid in reversed(children[node_id]):
+                if kid not in visited:
+                    stack.append((kid, depth + 1, False))
+
+        next_x += tree_spacing - node_spacing
+
+    return _centre(positions)
+
+
+def circular_layout(nodes: List[Tuple], edges: List[Tuple]) -> Positions:
+    """Place nodes evenly on a circle, in document order"""
+    spacing = VisualizerConfig.LAYOUTS["hierarchical"]["hierarchical"]["nodeSpacing"]
+    count = len(nodes)
+    if count == 0:
+        return {}
+
+    radius = max(200.0, count * spacing / (2 * math.pi))
+    return {
+        node[1]: (
+            radius * math.cos(2 * math.pi * index / count),
+            radius * math.sin(2 * math.pi * index / count)
+        )
+        for index, node in enumerate(nodes)
+    }
+
+
+def force_directed_layout(nodes: List[Tuple], edges: List[Tuple], iterations: int = 50) -> Positions:
+    """
+    Fruchterman-Reingold spring layout started from the tree layout
+
+    Repulsion is only computed between nodes in neighbouring grid cells, so
+    each iteration is roughly linear in the number of nodes.
+    """
+    settings = VisualizerConfig.LAYOUTS["force_directed"]["barnesHut"]
+    spring_length = float(settings["springLength"])
+
+    positions = hierarchical_layout(nodes, edges)
+    if len(positions) < 2:
+        return positions
+
+    node_ids = list(positions)
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    xs = [positions[node_id][0] for node_id in node_ids]
+    ys = [positions[node_id][1] for node_id in node_ids]
+    links = [
+        (index[source], index[target])
+        for source, target in edges
+        if source in index and target in index and source != target
+    ]
+
+    # Small jitter separates nodes that start on top of each other
+    rng = random.Random(VisualizerConfig.LAYOUTS["circular"]["layout"]["randomSeed"])
+    for i in range(len(xs)):
+        xs[i] += rng.uniform(-1, 1)
+        ys[i] += rng.uniform(-1, 1)
+
+    k = spring_length
+    cell = 2 * k
+    temperature = k * 2
+
+    for _ in range(iterations):
+        dx = [0.0] * len(xs)
+        dy = [0.0] * len(xs)
+
+        grid: Dict[Tuple[int, int], List[int]] = {}
+        for i in range(len(xs)):
+            grid.setdefault((int(xs[i] // cell), int(ys[i] // cell)), []).append(i)
+
+        for (cx, cy), members in grid.items():
+            neighbours = []
+            for ox in (-1, 0, 1):
+                for oy in (-1, 0, 1):
+                    neighbours.extend(grid.get((cx + ox, cy + oy), ()))
+            for i in members:
+                xi, yi = xs[i], ys[i]
+                for j in neighbours:
+                    if i == j:
+                        continue
+                    ddx, ddy = xi - xs[j], yi - ys[j]
+                    dist2 = ddx * ddx + ddy * ddy or 0.01
+                    if dist2 > cell * cell:
+                        continue
+                    force = k * k / dist2
+                    dx[i] += ddx * force
+                    dy[i] += ddy * force
+
+        for i, j in links:
+            ddx, ddy = xs[i] - xs[j], ys[i] - ys[j]
+            dist = math.sqrt(ddx * ddx + ddy * ddy) or 0.01
+            force = dist / k
+            dx[i] -= ddx * force
+            dy[i] -= ddy * force
+            dx[j] += ddx * force
+            dy[j] += ddy * force
+
+        for i in range(len(xs)):
+            length = math.sqrt(dx[i] * dx[i] + dy[i] * dy[i])
+            if length > 0:
+                step = min(length, temperature) / length
+                xs[i] += dx[i] * step
+                ys[i] += dy[i] * step
+
+        temperature *= 0.95
+
+    return _centre({node_id: (xs[i], ys[i]) for i, node_id in enumerate(node_ids)})
+
+
+LAYOUT_FUNCTIONS = {
+    "force_directed": force_directed_layout,
+    "hierarchical": hierarchical_layout,
+    "circular": circular_layout,
+}
+
+
+def compute_layout(nodes: List[Tuple], edges: List[Tuple], layout: str = "force_directed",
+                   iterations: int = 50) -> Positions:
+    """
+    Compute node positions for one of the VisualizerConfig layouts
+
+    Args:
+        nodes: List of node tuples (type, id, label, schema_type)
+        edges: List of edge tuples (source, target)
+        layout: Layout type ('force_directed', 'hierarchical', 'circular')
+        iterations: Simulation steps for the force-directed layout
+
+    Returns:
+        Mapping of node ID to (x, y), centred on the origin
+    """
+    layout_function = LAYOUT_FUNCTIONS.get(layout, LAYOUT_FUNCTIONS[VisualizerConfig.DEFAULT_LAYOUT])
+    if layout_function is force_directed_layout:
+        return layout_function(nodes, edges, iterations)
+    return layout_function(nodes, edges)
+
+
+def _centre(positions: Positions) -> Positions:
+    if not positions:
+        return positions
+    xs = [x for x, _ in positions.values()]
+    ys = [y for _, y in positions.values()]
+    mid_x = (min(xs) + max(xs)) / 2
+    mid_y = (min(ys) + max(ys)) / 2
+    return {node_id: (x - mid_x, y - mid_y) for node_id, (x, y) in positions.items()}
@@ -0,0 +1,60 @@
+"""
+Skip-unchanged writes for generated pages and graph exports
+"""
+
+import hashlib
+import os
+from typing import Union
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    """Get the SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_unchanged(path: str, content: bytes) -> bool:
+    """Whether a file already holds exactly these bytes, compared by SHA-256"""
+    try:
+        # A size mismatch settles it without reading the old file
+        return (os.path.getsize(path) == len(content)
+                and file_digest(path) == hashlib.sha256(content).hexdigest())
+    except OSError:
+        return False
+
+
+def write_atomic(path: str, content: bytes):
+    """Write through a temp file, so readers never see a partial file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def write_if_changed(path: str, content: Union[str, bytes]) -> bool:
+    """
+    Write content unless the file already holds exactly the same bytes
+
+    Unchanged files keep their modification time, so sync tools and storage
+    dedup only see the files that really changed.
+
+    Args:
+        path: Output file path
+        content: Text (encoded as UTF-8) or bytes
+
+    Returns:
+        True if the file was written, False if it was unchanged
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    if is_unchanged(path, content):
+        return False
+
+    write_atomic(path, content)
+    return True
@@ -3,52 +3,72 @@ Schema parser for converting JSON-LD to graph structure
 """
 
 import json
-from typing import Dict, List, Tuple, Set, Any
+import mmap
+import os
+from typing import Dict, List, Tuple, Any, Optional
+
+from .budget import GraphBudget, DegradationReport, LEVEL_TRUNCATE_LABELS, LEVEL_DROP_LEAVES, LEVEL_STOP
+from .decoding import JsonDecoder, get_decoder
+from .streaming import load_lazy
 
 
 class SchemaParser:
     """Parse Schema.org JSON-LD markup into graph nodes and edges"""
 
-    def __init__(self):
-        self.nodes: Set[Tuple] = set()
-        self.edges: Set[Tuple] = set()
+    def __init__(self, budget: Optional[GraphBudget] = None, decoder: Optional[JsonDecoder] = None):
+        """
+        Initialize parser
+
+        Args:
+            budget: Optional node/memory budget. When it is reached the graph
+                is degraded (see DegradationReport) instead of growing further.
+            decoder: JSON decoder to use (default: fastest installed backend)
+        """
+        # Lists keep document order, so output is identical from run to run;
+        # node IDs are unique by construction, so nothing needs deduplicating
+        self.nodes: List[Tuple] = []
+        self.edges: List[Tuple] = []
         self.node_counter = 0
+        self.budget = budget
+        self.report = DegradationReport()
+        self._exhausted = False
+        self.decoder = decoder or get_decoder()
 
     def parse(self, schema_input: str) -> Dict[str, Any]:
         """
         Parse schema input and return nodes and edges
 
         Args:
-            schema_input: JSON-LD string or file path
+            schema_input: JSON-LD string or bytes, or file path
 
         Returns:
-            Dictionary with 'nodes', 'edges', and optionally 'error'
+            Dictionary with 'nodes', 'edges', and optionally 'error' and
+            'degradation' (when a budget forced a simplified graph)
         """
         try:
-            # Try to parse as JSON
-            if isinstance(schema_input, str):
-                if schema_input.strip().startswith('{') or schema_input.strip().startswith('['):
-                    schema_data = json.loads(schema_input)
-                else:
-                    # Assume it's a file path
-                    with open(schema_input, 'r', encoding='utf-8') as f:
-                        schema_data = json.load(f)
-            else:
-                schema_data = schema_input
+            self.report = DegradationReport()
+            self._exhausted = False
+            if self.budget is not None:
+                self.budget.start()
+
+            schema_data = self.load(schema_input)
 
             # Reset nodes and edges
-            self.nodes = set()
-            self.edges = set()
+            self.nodes = []
+            self.edges = []
             self.node_counter = 0
 
             # Parse the schema
             self._recursive_parse(schema_data)
 
-            return {
+            result = {
                 "nodes": list(self.nodes),
                 "edges": list(self.edges),
                 "valid": True
             }
+            if self.report.degraded:
+                result["degradation"] = self.report.to_dict()
+            return result
 
         except json.JSONDecodeError as e:
             return {
@@ -66,6 +86,90 @@ class SchemaParser:
                 "valid": False
             }
 
+    def load(self, schema_input: Any) -> Any:
+        """
+        Decode schema input without building the graph
+
+        Args:
+            schema_input: JSON-LD string or bytes, file path, or already-decoded data
+
+        Returns:
+            Decoded data. Files are decoded straight from a memory map. Files
+            and bytes too large for the memory budget have their top-level
+            arrays decoded lazily, one item at a time.
+        """
+        if isinstance(schema_input, (bytes, bytearray, memoryview)):
+            if self.budget is not None and self.budget.should_stream(len(schema_input)):
+                self.report.streamed = True
+                return load_lazy(schema_input, self.decoder.loads)
+            return self.decoder.loads(schema_input)
+
+        if not isinstance(schema_input, str):
+            return schema_input
+
+        # An existing file wins, even if its name starts with '[' or '{'
+        if not os.path.isfile(schema_input) and schema_input.lstrip().startswith(('{', '[')):
+            return self.decoder.loads(schema_input)
+
+        # Assume it's a file path
+        if self.budget is not None and self.budget.should_stream(os.path.getsize(schema_input)):
+            with open(schema_input, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.report.streamed = True
+            return load_lazy(buffer, self.decoder.loads)
+
+        return self.decoder.load_file(schema_input)
+
+    def _add_node(self, node: Tuple, leaf: bool = False) -> bool:
+        """
+        Add a node, degrading or refusing it when over budget
+
+        Args:
+            node: Node tuple (type, id, label, schema_type)
+            leaf: Whether the node is a simple-valued property
+
+        Returns:
+            True if the node was added
+        """
+        if self.budget is not None:
+            level = self.budget.level(len(self.nodes), self.report)
+
+            if level >= LEVEL_STOP:
+                self._exhausted = True
+                self.report.skipped_nodes += 1
+                return False
+
+            if leaf and level >= LEVEL_DROP_LEAVES:
+                self.report.dropped_leaves += 1
+                return False
+
+            if level >= LEVEL_TRUNCATE_LABELS:
+                node = node[:2] + (self.budget.truncate(node[2], self.report),) + node[3:]
+
+        self.nodes.append(node)
+        return True
+
+    def _cluster_remaining(self, data: list, index: int, parent: str) -> bool:
+        """
+        Collapse the rest of an array into a single cluster node when degraded
+
+        Returns:
+            True if the remaining items were clustered
+        """
+        if (self.budget is None or index < self.budget.cluster_keep
+                or self.budget.level(len(self.nodes), self.report) < LEVEL_TRUNCATE_LABELS):
+            return False
+
+        remaining = len(data) - index
+        cluster_id = f"cluster_{self.node_counter}"
+        self.node_counter += 1
+
+        if self._add_node(("property", cluster_id, f"... {remaining} more items", "cluster")):
+            if parent:
+                self.edges.append((parent, cluster_id))
+            self.report.clustered_items += remaining
+        return True
+
     def _recursive_parse(self, data: Any, parent: str = None, path: str = "") -> str:
         """
         Recursively parse schema data to extract nodes and edges
@@ -97,16 +201,20 @@ class SchemaParser:
                 node_label = data.get('name', schema_type)
 
                 # Add type node
-                self.nodes.add(("type", node_id, node_label, schema_type))
+                if not self._add_node(("type", node_id, node_label, schema_type)):
+                    return None
 
                 # Connect to parent if exists
                 if parent:
-                    self.edges.add((parent, node_id))
+                    self.edges.append((parent, node_id))
 
                 current_node = node_id
 
             # Process all properties
             for key, value in data.items():
+                if self._exhausted:
+                    break
+
                 if key in ["@type", "@context", "name"]:
                     continue
 
@@ -114,9 +222,10 @@ class SchemaParser:
                 if key == "@id":
                     prop_id = f"id_{self.node_counter}"
                     self.node_counter += 1
-                    self.nodes.add(("property", prop_id, f"@id: {value}", "identifier"))
+                    if not self._add_node(("property", prop_id, f"@id: {value}", "identifier")):
+                        continue
                     if current_node:
-                        self.edges.add((current_node, prop_id))
+                        self.edges.append((current_node, prop_id))
                     continue
 
                 # Create property node
@@ -128,11 +237,12 @@ class SchemaParser:
 
                 if is_complex:
                     # For complex values, create property node and recurse
-                    self.nodes.add(("property", prop_id, key, "property"))
+                    if not self._add_node(("property", prop_id, key, "property")):
+                        continue
                     if current_node:
-                        self.edges.add((current_node, prop_id))
-                    else:
-                        self.edges.add((parent, prop_id))
+                        self.edges.append((current_node, prop_id))
+                    elif parent:
+                        self.edges.append((parent, prop_id))
 
                     self._recursive_parse(value, prop_id, f"{path}_{key}")
                 else:
@@ -142,16 +252,19 @@ class SchemaParser:
                         display_value = display_value[:47] + "..."
 
                     label = f"{key}: {display_value}"
-                    self.nodes.add(("property", prop_id, label, "property"))
+                    if not self._add_node(("property", prop_id, label, "property"), leaf=True):
+                        continue
 
                     if current_node:
-                        self.edges.add((current_node, prop_id))
+                        self.edges.append((current_node, prop_id))
                     elif parent:
-                        self.edges.add((parent, prop_id))
+                        self.edges.append((parent, prop_id))
 
         elif isinstance(data, list):
             # Handle arrays (e.g., multiple items in a list)
             for index, item in enumerate(data):
+                if self._exhausted or self._cluster_remaining(data, index, parent):
+                    break
                 self._recursive_parse(item, parent, f"{path}_{index}")
 
         return current_node
@@ -0,0 +1,484 @@
+"""
+Asyncio ingestion pipeline for batch visualization of many schema documents
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import posixpath
+import re
+import tarfile
+import time
+import urllib.request
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urljoin, urlparse
+
+from .budget import GraphBudget
+from .decoding import get_decoder
+from .parser import SchemaParser
+from .thumbnail import ThumbnailRenderer, check_format
+
+
+# Sentinel telling dispatchers that all producers have finished
+_DONE = None
+
+SCHEMA_EXTENSIONS = ('.json', '.jsonld')
+
+_ARCHIVE_SUFFIX = re.compile(r'\.(zip|tar|tgz|tar\.gz|tar\.bz2|tar\.xz)$', re.IGNORECASE)
+
+# A document's raw bytes, or the path of a local file the worker reads itself
+Content = Union[bytes, str]
+
+
+def iter_directory(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (name, file_path) for every schema file below a directory
+
+    Files are not read here: workers memory-map them, so a huge file is
+    neither held by a reader nor copied to the worker.
+    """
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for filename in sorted(files):
+            if not filename.lower().endswith(SCHEMA_EXTENSIONS):
+                continue
+            file_path = os.path.join(root, filename)
+            yield os.path.relpath(file_path, path), file_path
+
+
+def iter_archive(path: str) -> Iterator[Tuple[str, bytes]]:
+    """Yield (name, content) for every schema file in a tar or zip archive"""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(SCHEMA_EXTENSIONS):
+                    yield info.filename, archive.read(info)
+    else:
+        # Stream mode keeps compressed tarballs sequential and memory-light
+        with tarfile.open(path, 'r|*') as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(SCHEMA_EXTENSIONS):
+                    yield member.name, archive.extractfile(member).read()
+
+
+def iter_http(url: str, timeout: float = 30) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (name, content) from a local HTTP endpoint
+
+    An endpoint returning a JSON array of strings is treated as an index of
+    document URLs (relative URLs are resolved against it); any other response
+    is a single document.
+    """
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        content = response.read()
+
+    try:
+        index = json.loads(content)
+    except ValueError:
+        index = None
+
+    if isinstance(index, list) and index and all(isinstance(item, str) for item in index):
+        for item in index:
+            document_url = urljoin(url, item)
+            with urllib.request.urlopen(document_url, timeout=timeout) as response:
+                yield urlparse(document_url).path.lstrip('/') or document_url, response.read()
+    else:
+        yield urlparse(url).path.lstrip('/') or url, content
+
+
+def iter_source(source: str) -> Iterator[Tuple[str, Content]]:
+    """
+    Yield (name, content) pairs from a directory, archive, URL or single file
+
+    Content is the document's bytes, or the path of a local file.
+    """
+    if source.startswith(('http://', 'https://')):
+        return iter_http(source)
+    if os.path.isdir(source):
+        return iter_directory(source)
+    if zipfile.is_zipfile(source) or tarfile.is_tarfile(source):
+        return iter_archive(source)
+    return _iter_file(source)
+
+
+def _iter_file(path: str) -> Iterator[Tuple[str, str]]:
+    """Yield a single schema file by path"""
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"No such file: {path}")
+    yield os.path.basename(path), path
+
+
+def output_name(name: str) -> str:
+    """Turn a source-relative document name into a flat, filesystem-safe file stem"""
+    stem = posixpath.normpath(name.replace('\\', '/')).lstrip('./')
+    stem = re.sub(r'\.(json|jsonld)$', '', stem, flags=re.IGNORECASE)
+    stem = stem.replace('/', '__')
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', stem) or "document"
+
+
+def source_labels(sources: List[str]) -> List[str]:
+    """
+    Give each source a distinct, filesystem-safe label
+
+    Labels prefix the output names of multi-source runs, so documents with
+    the same relative path in two directories or archives do not overwrite
+    each other. Repeated labels get a '-2', '-3', ... suffix in source order.
+    """
+    labels = []
+    for source in sources:
+        if source.startswith(('http://', 'https://')):
+            parsed = urlparse(source)
+            base = parsed.netloc + parsed.path
+        else:
+            base = os.path.basename(os.path.normpath(source))
+        label = output_name(_ARCHIVE_SUFFIX.sub('', base))
+
+        candidate, count = label, 1
+        while candidate in labels:
+            count += 1
+            candidate = f"{label}-{count}"
+        labels.append(candidate)
+    return labels
+
+
+def process_document(name: str, content: Content, options: Dict[str, Any],
+                     stem: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse and render one document (runs inside a worker process)
+
+    Args:
+        name: Source-relative document name
+        content: Raw document bytes, or the path of a local file
+        options: Output directory, visualizer settings and export flags
+        stem: Output file stem (default: derived from name)
+
+    Returns:
+        Summary with 'name', 'valid', 'error', graph statistics, the number
+        of output files left unchanged, and 'degradation': what a budget
+        simplified, as a list of report lines per stage ('parsing',
+        'rendering'), for the stages that were degraded
+    """
+    from .visualizer import SchemaVisualizer
+
+    budget = None
+    if options.get("max_nodes") or options.get("max_memory"):
+        budget = GraphBudget(max_nodes=options.get("max_nodes"), max_memory=options.get("max_memory"))
+
+    parser = SchemaParser(budget=budget, decoder=get_decoder(options.get("json_backend", "auto")))
+    result = parser.parse(content)
+
+    if not result.get('valid', False):
+        return {"name": name, "valid": False, "error": result.get('error')}
+
+    stem = stem or output_name(name)
+    summary = {"name": name, "valid": True, "error": None}
+    summary.update(parser.get_statistics())
+    summary["unchanged"] = 0
+    degradation: Dict[str, List[str]] = {}
+
+    def record(stage, report):
+        if report.degraded:
+            lines = degradation.setdefault(stage, [])
+            lines.extend(line for line in report.summary() if line not in lines)
+
+    record("parsing", parser.report)
+
+    if options.get("html", True) or options.get("export_json"):
+        visualizer = SchemaVisualizer(
+            layout=options["layout"],
+            theme=options["theme"],
+            assets_dir=options.get("assets_dir"),
+            budget=budget
+        )
+
+        # Keep per-file progress lines out of the pipeline report
+        with contextlib.redirect_stdout(io.StringIO()):
+            if options.get("html", True):
+                visualizer.create_visualization(
+                    result['nodes'],
+                    result['edges'],
+                    output_file=os.path.join(options["output_dir"], f"{stem}.html"),
+                    auto_open=False
+                )
+            if options.get("export_json"):
+                visualizer.export_json(
+                    result['nodes'],
+                    result['edges'],
+                    os.path.join(options["output_dir"], f"{stem}.graph.json"),
+                    include_layout=options.get("export_layout", False)
+                )
+
+        record("rendering", visualizer.report)
+        summary["unchanged"] += len(visualizer.unchanged)
+
+    if options.get("thumbnails"):
+        renderer = ThumbnailRenderer(layout=options["layout"], theme=options["theme"], budget=budget)
+        thumbnail_file = os.path.join(options["output_dir"], f"{stem}.{options['thumbnails']}")
+        if not renderer.save(result['nodes'], result['edges'], thumbnail_file):
+            summary["unchanged"] += 1
+        record("rendering", renderer.report)
+
+    summary["degradation"] = degradation
+    summary["degraded"] = bool(degradation)
+    return summary
+
+
+class PipelineMetrics:
+    """Throughput and queue-depth counters for a pipeline run"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.read = 0
+        self.bytes_read = 0
+        self.processed = 0
+        self.degraded = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.errors: List[Tuple[str, str]] = []
+        # (document name, {stage: report lines}) for documents a budget simplified
+        self.degradations: List[Tuple[str, Dict[str, List[str]]]] = []
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current metrics as a dictionary"""
+        elapsed = max(self.elapsed(), 1e-9)
+        return {
+            "elapsed": elapsed,
+            "read": self.read,
+            "processed": self.processed,
+            "degraded": self.degraded,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "docs_per_second": (self.processed + self.failed) / elapsed,
+            "mb_per_second": self.bytes_read / elapsed / (1024 * 1024),
+            "errors": list(self.errors),
+            "degradations": list(self.degradations)
+        }
+
+    def format(self) -> str:
+        """Format a one-line progress report"""
+        snap = self.snapshot()
+        return (
+            f"[{snap['elapsed']:7.1f}s] read {snap['read']} · done {snap['processed']} · "
+            f"degraded {snap['degraded']} · unchanged {snap['unchanged']} · "
+            f"failed {snap['failed']} · {snap['docs_per_second']:.1f} docs/s · "
+            f"{snap['mb_per_second']:.2f} MB/s · queue {snap['queue_depth']}"
+            f" (max {snap['max_queue_depth']}) · in-flight {snap['in_flight']}"
+        )
+
+
+class IngestionPipeline:
+    """Read schema documents concurrently and render them in a process pool"""
+
+    def __init__(self, output_dir: str, layout: str = "force_directed", theme: str = "dark",
+                 assets_dir: Optional[str] = None, export_json: bool = False,
+                 export_layout: bool = False, thumbnails: Optional[str] = None, html: bool = True,
+                 workers: Optional[int] = None, queue_size: int = 64,
+                 max_nodes: Optional[int] = None, max_memory: Optional[int] = None,
+                 json_backend: str = "auto",
+                 report_interval: float = 2.0, quiet: bool = False):
+        """
+        Initialize pipeline
+
+        Args:
+            output_dir: Directory receiving one HTML file per document
+            layout: Layout type passed to SchemaVisualizer
+            theme: Color theme passed to SchemaVisualizer
+            assets_dir: Shared offline asset directory (see AssetBundle)
+            export_json: Also write '<name>.graph.json' next to each page
+            export_layout: Precompute node positions in the exported JSON
+            thumbnails: Also write a '<name>.svg' or '<name>.png' thumbnail
+                ('svg' or 'png', see ThumbnailRenderer)
+            html: Write the interactive HTML page for each document
+            workers: Number of worker processes (default: CPU count)
+            queue_size: Maximum documents buffered between readers and workers
+            max_nodes: Per-document node budget (see GraphBudget)
+            max_memory: Per-worker memory budget in bytes (see GraphBudget)
+            json_backend: JSON decoding backend (see JsonDecoder)
+            report_interval: Seconds between progress reports
+            quiet: Suppress progress reports
+
+        Raises:
+            ValueError: If the thumbnail format cannot be rendered
+        """
+        if thumbnails:
+            check_format(thumbnails)
+
+        self.output_dir = output_dir
+        self.options = {
+            "output_dir": output_dir,
+            "layout": layout,
+            "theme": theme,
+            "assets_dir": assets_dir,
+            "export_json": export_json,
+            "export_layout": export_layout,
+            "thumbnails": thumbnails,
+            "html": html,
+            "max_nodes": max_nodes,
+            "max_memory": max_memory,
+            "json_backend": json_backend
+        }
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.report_interval = report_interval
+        self.quiet = quiet
+        self.metrics = PipelineMetrics()
+        # Output stem -> document name, to catch documents that would overwrite each other
+        self._stems: Dict[str, str] = {}
+
+    def run(self, sources: List[str]) -> Dict[str, Any]:
+        """Run the pipeline to completion and return the final metrics"""
+        return asyncio.run(self.run_async(sources))
+
+    async def run_async(self, sources: List[str]) -> Dict[str, Any]:
+        """
+        Run the pipeline on the current event loop
+
+        Args:
+            sources: Directories, tar/zip archives, HTTP URLs or single files
+
+        Returns:
+            Final metrics snapshot
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.metrics = PipelineMetrics()
+        self._stems = {}
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        # Sources are handed out to at most one reader thread per worker, so at
+        # most reader_count + queue_size documents are held in memory at once;
+        # workers * 2 dispatchers keep the pool busy while bounding in-flight documents
+        pending: SimpleQueue = SimpleQueue()
+        labels = source_labels(sources) if len(sources) > 1 else [None] * len(sources)
+        for label, source in zip(labels, sources):
+            pending.put((label, source))
+        reader_count = max(min(len(sources), self.workers), 1)
+        dispatcher_count = self.workers * 2
+
+        with ThreadPoolExecutor(max_workers=reader_count) as readers, \
+                ProcessPoolExecutor(max_workers=self.workers) as pool:
+            reporter = asyncio.ensure_future(self._report())
+            dispatchers = [
+                asyncio.ensure_future(self._dispatch(queue, pool))
+                for _ in range(dispatcher_count)
+            ]
+
+            producers = [
+                loop.run_in_executor(readers, self._read_sources, pending, queue, loop)
+                for _ in range(reader_count)
+            ]
+
+            try:
+                await asyncio.gather(*producers)
+            finally:
+                for _ in dispatchers:
+                    await queue.put(_DONE)
+                await asyncio.gather(*dispatchers)
+                reporter.cancel()
+
+        if not self.quiet:
+            print(self.metrics.format())
+
+        return self.metrics.snapshot()
+
+    def _read_sources(self, pending: SimpleQueue, queue: asyncio.Queue,
+                      loop: asyncio.AbstractEventLoop):
+        """Read sources in a reader thread until none are left"""
+        while True:
+            try:
+                label, source = pending.get_nowait()
+            except Empty:
+                return
+            self._produce(source, label, queue, loop)
+
+    def _produce(self, source: str, label: Optional[str], queue: asyncio.Queue,
+                 loop: asyncio.AbstractEventLoop):
+        """Read one source in a thread, blocking while the queue is full"""
+        try:
+            for name, content in iter_source(source):
+                stem = output_name(name)
+                if label:
+                    stem = f"{label}__{stem}"
+                asyncio.run_coroutine_threadsafe(
+                    self._enqueue(queue, (name, content, stem)), loop
+                ).result()
+        except Exception as e:
+            asyncio.run_coroutine_threadsafe(
+                self._record_failure(source, f"Error reading source: {e}"), loop
+            ).result()
+
+    async def _enqueue(self, queue: asyncio.Queue, item: Tuple[str, Content, str]):
+        name, content, stem = item
+        self.metrics.read += 1
+        self.metrics.bytes_read += os.path.getsize(content) if isinstance(content, str) else len(content)
+
+        # Claimed on the event loop, so concurrent readers cannot race for a stem
+        if stem in self._stems:
+            await self._record_failure(
+                name, f"Output name '{stem}' is already used by {self._stems[stem]}"
+            )
+            return
+        self._stems[stem] = name
+
+        await queue.put(item)
+        self._update_depth(queue)
+
+    async def _record_failure(self, name: str, error: str):
+        self.metrics.failed += 1
+        self.metrics.errors.append((name, error))
+
+    async def _dispatch(self, queue: asyncio.Queue, pool: ProcessPoolExecutor):
+        """Feed queued documents to the process pool one at a time"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            item = await queue.get()
+            self._update_depth(queue)
+            if item is _DONE:
+                return
+
+            name, content, stem = item
+            self.metrics.in_flight += 1
+            try:
+                summary = await loop.run_in_executor(
+                    pool, process_document, name, content, self.options, stem
+                )
+            except Exception as e:
+                summary = {"name": name, "valid": False, "error": f"Error rendering schema: {e}"}
+            finally:
+                self.metrics.in_flight -= 1
+
+            if summary["valid"]:
+                self.metrics.processed += 1
+                if summary.get("degraded"):
+                    self.metrics.degraded += 1
+                    self.metrics.degradations.append((name, summary["degradation"]))
+                self.metrics.unchanged += summary.get("unchanged", 0)
+            else:
+                await self._record_failure(name, summary["error"])
+
+    async def _report(self):
+        """Print progress periodically until cancelled"""
+        while True:
+            await asyncio.sleep(self.report_interval)
+            if not self.quiet:
+                print(self.metrics.format())
+
+    def _update_depth(self, queue: asyncio.Queue):
+        self.metrics.queue_depth = queue.qsize()
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.metrics.queue_depth)
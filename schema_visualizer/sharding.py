@@ -0,0 +1,563 @@
+"""
+Sharded multi-process parsing of a single huge @graph or JSON Lines document
+"""
+
+import array
+import json
+import mmap
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple
+
+from .decoding import JsonDecoder, get_decoder
+from .parser import SchemaParser
+from .streaming import LazyJsonArray, iter_object_members, skip_whitespace, value_end
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None
+
+JSON_LINES_EXTENSIONS = ('.jsonl', '.ndjson')
+
+_BOM = b'\xef\xbb\xbf'
+
+# Stand-in for the shard's parent node; cannot collide with a generated ID
+_PARENT_TOKEN = "\x00parent"
+_PARENT_INDEX = -1
+
+# Bytes dropped before counting brackets, and the depth step of those kept
+_NOT_STRUCTURAL = bytes(sorted(set(range(256)) - set(b'"[]{}')))
+_DEPTH_STEPS = bytes.maketrans(b'[]{}', b'\x01\xff\x01\xff')
+
+# Rest of a string whose opening quote is behind us
+_STRING_REST = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Everything up to the next bracket or comma, with whole strings skipped in one step
+_TO_SEPARATOR = re.compile(rb'(?:[^"\[\]{},]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+# What may follow the @graph array when it is the last member
+_GRAPH_TAIL = re.compile(rb'[ \t\n\r]*\}[ \t\n\r]*\Z')
+
+_OPEN = b'[{'
+_CLOSE = b']}'
+_COMMA = ord(',')
+
+# Shard node counts shared by the workers of one parse; set by _init_worker
+_shared: Dict[str, Any] = {}
+
+# A shard boundary: (position, in_string, depth); depth None means the
+# position is known to sit between items
+Cut = Tuple[int, bool, Optional[int]]
+
+
+class ShardedArray(LazyJsonArray):
+    """
+    A top-level array (or JSON Lines file) to be parsed in shards
+
+    The ShardedSchemaParser hands its items to worker processes; anything
+    else iterating it decodes the items lazily, like a LazyJsonArray.
+    """
+
+    def __init__(self, buf, start: int, end: int, decode=None, path: str = None,
+                 json_lines: bool = False):
+        """
+        Args:
+            buf: Memory-mapped document
+            start: Position of the opening bracket (of the first line for JSON Lines)
+            end: Position just past the array (the end of the file for JSON Lines)
+            decode: Function decoding one JSON value from bytes
+            path: File the workers map for themselves
+            json_lines: Whether the items are lines rather than array items
+        """
+        super().__init__(buf, start, decode or get_decoder().loads)
+        self.end = end
+        self.path = path
+        self.json_lines = json_lines
+        self.cuts: List[Cut] = []
+
+    def __iter__(self):
+        if not self.json_lines:
+            yield from super().__iter__()
+            return
+        for line in self.buf[self.start:self.end].splitlines():
+            if line.strip():
+                yield self.decode(line)
+
+    @property
+    def limit(self) -> int:
+        """Position just past the last item"""
+        return self.end if self.json_lines else self.end - 1
+
+    def chunks(self, count: int) -> List[int]:
+        """
+        Split the items' byte range into about count chunks of similar size
+
+        Positions are only moved off escaped characters here; nothing is
+        scanned. Item boundaries are found later, by the workers.
+
+        Returns:
+            Chunk start positions followed by the end of the last chunk
+        """
+        low, high = self.start + 1, self.limit
+        positions = {low, high}
+        for index in range(1, count):
+            position = low + (high - low) * index // count
+            # The character after a backslash may be escaped; never start there
+            while position < high and self.buf[position - 1] == ord('\\'):
+                position += 1
+            positions.add(position)
+        return sorted(positions)
+
+    def line_cuts(self, count: int) -> List[Cut]:
+        """Split a JSON Lines file at newlines into about count shards"""
+        # Jump ahead and round up to the next newline, so nothing is scanned here
+        size = self.end
+        step = max((size - self.start) // count, 1)
+        cuts = [(self.start, False, None)]
+        start = self.start
+        while start < size:
+            end = self.buf.find(b'\n', min(start + step, size - 1), size)
+            start = size if end == -1 else end + 1
+            cuts.append((start, False, None))
+        return cuts
+
+
+def _init_worker(counts, ready):
+    _shared["counts"] = counts
+    _shared["ready"] = ready
+
+
+def _depth_profile(parts: List[bytes]) -> Tuple[int, int]:
+    """Get the net depth change and the lowest relative depth of bracket-only text"""
+    steps = array.array('b', b''.join(parts).translate(_DEPTH_STEPS))
+    return sum(steps), min(0, min(accumulate(steps), default=0))
+
+
+def profile_chunk(path: str, start: int, end: int) -> Tuple[Tuple[bool, int, int], ...]:
+    """
+    Summarize how a chunk changes the string state and bracket depth (runs inside a worker)
+
+    Whether the chunk starts inside a string is not known yet, so both cases
+    are answered; the caller chains the chunks from the start of the array.
+
+    Returns:
+        Two (ends_in_string, net_depth, lowest_depth) tuples: for a chunk
+        starting outside a string, and for one starting inside a string
+    """
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            content = buf[start:end]
+
+    # Escapes go first, so only unescaped quotes and brackets remain
+    content = content.replace(b'\\\\', b'').replace(b'\\"', b'').translate(None, _NOT_STRUCTURAL)
+    parts = content.split(b'"')
+    del content
+
+    # Parts alternate between outside and inside strings
+    quotes_odd = len(parts) % 2 == 0
+    return (
+        (quotes_odd,) + _depth_profile(parts[0::2]),
+        (not quotes_odd,) + _depth_profile(parts[1::2]),
+    )
+
+
+def _separator(buf, cut: Cut, limit: int) -> Tuple[int, int]:
+    """
+    Find the item boundary at or after a cut
+
+    Returns:
+        (end of the items before it, start of the items after it)
+    """
+    pos, in_string, depth = cut
+    if depth is None:
+        return pos, pos
+
+    if in_string:
+        match = _STRING_REST.match(buf, pos)
+        if not match:
+            return limit, limit
+        pos = match.end()
+
+    while True:
+        pos = _TO_SEPARATOR.match(buf, pos).end()
+        if pos >= limit:
+            return limit, limit
+        char = buf[pos]
+        if char == _COMMA:
+            if depth == 1:
+                return pos, pos + 1
+        elif char in _OPEN:
+            depth += 1
+        elif char in _CLOSE:
+            depth -= 1
+        else:
+            # An unterminated string; leave the error to the decoder
+            return limit, limit
+        pos += 1
+
+
+def _decode_items(parser: SchemaParser, content: bytes, start: int,
+                  json_lines: bool) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+    """
+    Decode a shard's items
+
+    Returns:
+        Tuple of (items, error); error has the decoder's message and the
+        absolute byte position of the problem
+    """
+    def error(e, offset):
+        before = e.doc[:e.pos]
+        if isinstance(before, str):
+            before = before.encode('utf-8', 'surrogatepass')
+        return {"error": e.msg, "position": offset + len(before)}
+
+    if not json_lines:
+        try:
+            # The range holds whole, comma-separated items: decode them in one call
+            return parser.decoder.loads(b'[' + content + b']'), None
+        except json.JSONDecodeError as e:
+            # Less the '[' put in front
+            return [], error(e, start - 1)
+
+    items = []
+    offset = start
+    for line in content.splitlines(keepends=True):
+        if line.strip():
+            try:
+                items.append(parser.decoder.loads(line))
+            except json.JSONDecodeError as e:
+                return [], error(e, offset)
+        offset += len(line)
+    return items, None
+
+
+def parse_shard(index: int, path: str, start_cut: Cut, end_cut: Cut, limit: int,
+                json_lines: bool, has_parent: bool, path_prefix: str, base: int,
+                backend: str) -> Dict[str, Any]:
+    """
+    Parse one shard with a fresh SchemaParser (runs inside a worker process)
+
+    The shard's exact item range is found from its cuts. Once parsed, the
+    node count is published to the other workers, and the IDs are renumbered
+    past all earlier shards here, so the caller only has to append them.
+    Edges are written into a shared-memory int64 array as indices into the
+    shard's nodes (all sources, then all targets), with -1 standing for the
+    shard's parent node.
+
+    Returns:
+        Dictionary with 'kinds', 'ids', 'labels', 'schema_types', 'counter',
+        'edge_count', and 'edge_block' (or 'edges' when shared memory is
+        unavailable), or with 'error' and 'position' if the shard is not
+        valid JSON
+    """
+    counts, ready = _shared["counts"], _shared["ready"]
+    published = False
+
+    def publish(count):
+        with ready:
+            counts[index] = count
+            ready.notify_all()
+
+    try:
+        parser = SchemaParser(decoder=get_decoder(backend))
+        parent = _PARENT_TOKEN if has_parent else None
+
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                start = _separator(buf, start_cut, limit)[1]
+                end = _separator(buf, end_cut, limit)[0]
+                content = buf[start:end] if start < end else b''
+
+        items, error = _decode_items(parser, content, start, json_lines)
+        del content
+        if error:
+            return error
+
+        for item_index, item in enumerate(items):
+            parser._recursive_parse(item, parent, f"{path_prefix}_{item_index}")
+        del items
+
+        count = parser.node_counter
+        publish(count)
+        published = True
+
+        with ready:
+            ready.wait_for(lambda: all(counts[earlier] >= 0 for earlier in range(index)))
+            offset = base + sum(counts[:index])
+    finally:
+        if not published:
+            # Later shards must not wait for a count that never comes
+            publish(0)
+
+    if count:
+        kinds, node_ids, labels, schema_types = zip(*parser.nodes)
+    else:
+        kinds = node_ids = labels = schema_types = ()
+    numbers = {node_id: number for number, node_id in enumerate(node_ids)}
+    numbers[parent] = _PARENT_INDEX
+    ids = [f"{node_id.rpartition('_')[0]}_{number}"
+           for node_id, number in zip(node_ids, range(offset, offset + count))]
+
+    edge_values = array.array('q', [numbers[source] for source, _ in parser.edges])
+    edge_values.extend([numbers[target] for _, target in parser.edges])
+
+    result = {
+        "kinds": kinds,
+        "ids": ids,
+        "labels": labels,
+        "schema_types": schema_types,
+        "counter": count,
+        "edge_count": len(parser.edges)
+    }
+
+    if shared_memory is None:
+        result["edges"] = edge_values.tolist()
+        return result
+
+    block = shared_memory.SharedMemory(create=True, size=max(len(edge_values) * 8, 8))
+    block.buf[:len(edge_values) * 8] = edge_values.tobytes()
+    result["edge_block"] = block.name
+    block.close()
+    return result
+
+
+def _parse_shard_args(args):
+    return parse_shard(*args)
+
+
+def _profile_chunk_args(args):
+    return profile_chunk(*args)
+
+
+def _release_edges(result: Dict[str, Any]):
+    """Free a shard's shared edge block without reading it"""
+    if "edge_block" in result:
+        block = shared_memory.SharedMemory(name=result["edge_block"])
+        block.close()
+        block.unlink()
+
+
+class ShardedSchemaParser(SchemaParser):
+    """
+    SchemaParser that splits a huge top-level array across processes
+
+    Produces the same nodes and edges, in the same order, as a serial
+    SchemaParser run. Supports files whose top level is an array, an object
+    with an '@graph' array, or JSON Lines (one document per line, treated
+    like a top-level array).
+    Budgets are not applied in sharded mode.
+    """
+
+    def __init__(self, workers: Optional[int] = None, shards_per_worker: int = 4,
+                 decoder: Optional[JsonDecoder] = None):
+        """
+        Initialize sharded parser
+
+        Args:
+            workers: Number of worker processes (default: CPU count)
+            shards_per_worker: Shards queued per worker, for load balancing
+            decoder: JSON decoder to use (default: fastest installed backend)
+        """
+        super().__init__(decoder=decoder)
+        self.workers = workers or os.cpu_count() or 1
+        self.shards_per_worker = shards_per_worker
+        # Memory maps behind the ShardedArrays handed out by load()
+        self._buffers: List[mmap.mmap] = []
+
+    def parse(self, schema_input: str) -> Dict[str, Any]:
+        """Parse like SchemaParser.parse(), then unmap the input file"""
+        try:
+            return super().parse(schema_input)
+        finally:
+            while self._buffers:
+                self._buffers.pop().close()
+
+    def load(self, schema_input: Any) -> Any:
+        """
+        Decode the document, leaving its top-level array to the shards
+
+        A document whose brackets do not balance is decoded serially
+        instead, so its error matches a serial parse. An '@graph' array that
+        is not the last member is still sharded, but its end is found by
+        scanning it once first.
+        """
+        if not isinstance(schema_input, str) or not os.path.isfile(schema_input):
+            return super().load(schema_input)
+
+        if os.path.getsize(schema_input) == 0:
+            return self.decoder.loads(b'')
+
+        with open(schema_input, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        count = self.workers * self.shards_per_worker
+
+        pos = 3 if buffer[:3] == _BOM else 0
+        if schema_input.lower().endswith(JSON_LINES_EXTENSIONS):
+            data = ShardedArray(buffer, pos, len(buffer), self.decoder.loads,
+                                path=schema_input, json_lines=True)
+            data.cuts = data.line_cuts(count)
+            self._buffers.append(buffer)
+            return data
+
+        try:
+            data, sharded = self._load_outline(buffer, skip_whitespace(buffer, pos), schema_input)
+        except json.JSONDecodeError:
+            sharded = None
+
+        if sharded is not None and self._find_cuts(sharded, count):
+            self._buffers.append(buffer)
+            return data
+
+        buffer.close()
+        return self.decoder.load_file(schema_input)
+
+    def _load_outline(self, buf, pos: int, path: str) -> Tuple[Any, Optional[ShardedArray]]:
+        """
+        Decode everything but the array to shard
+
+        Returns:
+            Tuple of (data, sharded array), or (None, None) if the document
+            has no array to shard
+        """
+        if pos >= len(buf):
+            return None, None
+
+        if buf[pos] == ord('['):
+            # The array must be the whole document
+            end = len(buf)
+            while buf[end - 1] in b' \t\n\r':
+                end -= 1
+            if end - pos < 2 or buf[end - 1] != ord(']'):
+                return None, None
+            sharded = ShardedArray(buf, pos, end, self.decoder.loads, path=path)
+            return sharded, sharded
+
+        if buf[pos] != ord('{'):
+            return None, None
+
+        def find_end(key, start):
+            if key == "@graph" and buf[start] == ord('['):
+                # Assume @graph comes last rather than scan it; the chunk
+                # profiles confirm where it really ends
+                close = buf.rfind(b']')
+                if close > start and _GRAPH_TAIL.match(buf, close + 1):
+                    return close + 1
+            return value_end(buf, start)
+
+        data, sharded = {}, None
+        for key, start, end in iter_object_members(buf, pos, find_end):
+            if key == "@graph" and buf[start] == ord('['):
+                sharded = data[key] = ShardedArray(buf, start, end, self.decoder.loads, path=path)
+            else:
+                data[key] = self.decoder.loads(buf[start:end])
+        return data, sharded
+
+    def _find_cuts(self, data: ShardedArray, count: int) -> bool:
+        """
+        Profile the array's chunks in parallel and chain the results into cuts
+
+        Returns:
+            False if the chunks do not add up to a well-formed array
+        """
+        positions = data.chunks(count)
+        tasks = [(data.path, start, end) for start, end in zip(positions, positions[1:])]
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            profiles = list(pool.map(_profile_chunk_args, tasks))
+
+        # Directly inside the array, outside any string
+        in_string, depth = False, 1
+        cuts = []
+        for position, profile in zip(positions, profiles):
+            cuts.append((position, in_string, depth))
+            ends_in_string, net, lowest = profile[in_string]
+            if depth + lowest < 1:
+                return False
+            in_string, depth = ends_in_string, depth + net
+        if in_string or depth != 1:
+            return False
+
+        # The first and last cuts are exact
+        cuts.append((positions[-1], False, None))
+        cuts[0] = (positions[0], False, None)
+        data.cuts = cuts
+        return True
+
+    def _recursive_parse(self, data: Any, parent: str = None, path: str = "") -> str:
+        if isinstance(data, ShardedArray):
+            self._parse_shards(data, parent, path)
+            return None
+        return super()._recursive_parse(data, parent, path)
+
+    def _parse_shards(self, data: ShardedArray, parent: Optional[str], path: str):
+        """Parse shards in worker processes and merge them in document order"""
+        cuts = data.cuts
+        tasks = [
+            (index, data.path, start_cut, end_cut, data.limit, data.json_lines,
+             parent is not None, path, self.node_counter, self.decoder.backend)
+            for index, (start_cut, end_cut) in enumerate(zip(cuts, cuts[1:]))
+        ]
+        if not tasks:
+            return
+
+        if shared_memory is not None:
+            # Workers must share our tracker, or theirs would reclaim the
+            # edge blocks we unlink and warn about them at exit
+            resource_tracker.ensure_running()
+
+        # Each worker waits for the node counts of earlier shards to number its
+        # IDs; tasks start in order, so those shards are always running or done
+        counts = multiprocessing.Array('q', [-1] * len(tasks), lock=False)
+        ready = multiprocessing.Condition()
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(counts, ready)) as pool:
+            futures = [pool.submit(_parse_shard_args, task) for task in tasks]
+            merged = 0
+            try:
+                for future in futures:
+                    result = future.result()
+                    if "error" in result:
+                        raise self._decode_error(data, result)
+                    self._merge_shard(result, parent)
+                    merged += 1
+            finally:
+                # Shards not merged still hold shared edge blocks
+                for future in futures[merged:]:
+                    try:
+                        _release_edges(future.result())
+                    except Exception:
+                        pass
+
+    def _decode_error(self, data: ShardedArray, result: Dict[str, Any]) -> json.JSONDecodeError:
+        """Build the error a serial decode reports, from a shard's absolute byte position"""
+        doc_start = 3 if data.buf[:3] == _BOM else 0
+        before = data.buf[doc_start:result["position"]].decode('utf-8', 'replace')
+        return json.JSONDecodeError(result["error"], before, len(before))
+
+    def _merge_shard(self, result: Dict[str, Any], parent: Optional[str]):
+        """Add one shard's already renumbered nodes and its edges"""
+        # The ID list is indexed like the shard's nodes, and the parent is
+        # appended last, where _PARENT_INDEX (-1) finds it
+        ids = result["ids"]
+        self.nodes.extend(zip(result["kinds"], ids, result["labels"], result["schema_types"]))
+        ids.append(parent)
+
+        edge_count = result["edge_count"]
+        if "edge_block" in result:
+            block = shared_memory.SharedMemory(name=result["edge_block"])
+            try:
+                view = block.buf[:edge_count * 16].cast('q')
+                values = view.tolist()
+                view.release()
+            finally:
+                block.close()
+                block.unlink()
+        else:
+            values = result["edges"]
+
+        lookup = ids.__getitem__
+        self.edges.extend(zip(map(lookup, values[:edge_count]), map(lookup, values[edge_count:])))
+
+        self.node_counter += result["counter"]
@@ -0,0 +1,323 @@
+"""
+SQLite-backed persistent store for parsed schema graphs
+"""
+
+import itertools
+import json
+import sqlite3
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    crawled_at TEXT NOT NULL,
+    node_count INTEGER NOT NULL,
+    edge_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nodes (
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    node_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    label TEXT,
+    schema_type TEXT
+);
+CREATE TABLE IF NOT EXISTS edges (
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entities (
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    entity_id TEXT NOT NULL,
+    node_id TEXT,
+    schema_type TEXT,
+    properties TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_source ON documents(source, crawled_at);
+CREATE INDEX IF NOT EXISTS idx_nodes_document ON nodes(document_id);
+CREATE INDEX IF NOT EXISTS idx_nodes_type ON nodes(schema_type, kind, document_id);
+CREATE INDEX IF NOT EXISTS idx_edges_document ON edges(document_id);
+CREATE INDEX IF NOT EXISTS idx_entities_id ON entities(entity_id, document_id);
+"""
+
+ID_LABEL_PREFIX = "@id: "
+
+
+def _text(value: Any) -> Any:
+    """
+    Make a label or schema type bindable to SQLite
+
+    JSON-LD allows lists and value objects (e.g. "name": ["a", "b"]) where
+    the parser expects a string; they are stored as JSON text.
+    """
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+class GraphStore:
+    """Persist SchemaParser output and answer questions about crawl history"""
+
+    def __init__(self, db_path: str, batch_size: int = 10000):
+        """
+        Open (and create if needed) a graph database
+
+        Args:
+            db_path: Path to the SQLite database file
+            batch_size: Rows per executemany() call during bulk inserts
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+
+        # WAL lets readers query while a crawl is being ingested
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_graph(self, nodes: List[Tuple], edges: List[Tuple], source: str,
+                  crawled_at: Optional[str] = None) -> int:
+        """
+        Store one parsed graph
+
+        Args:
+            nodes: List of node tuples (type, id, label, schema_type)
+            edges: List of edge tuples (source, target)
+            source: Page URL or file the schema came from
+            crawled_at: ISO 8601 crawl timestamp (default: now, UTC)
+
+        Returns:
+            Document ID of the stored graph
+        """
+        with self.conn:
+            return self._insert_graph(nodes, edges, source, crawled_at)
+
+    def add_graphs(self, graphs: Iterable[Tuple[List[Tuple], List[Tuple], str, Optional[str]]]) -> List[int]:
+        """
+        Store many parsed graphs in a single transaction
+
+        Args:
+            graphs: Iterable of (nodes, edges, source, crawled_at) tuples
+
+        Returns:
+            Document IDs in input order
+        """
+        with self.conn:
+            return [
+                self._insert_graph(nodes, edges, source, crawled_at)
+                for nodes, edges, source, crawled_at in graphs
+            ]
+
+    def _insert_graph(self, nodes, edges, source, crawled_at) -> int:
+        crawled_at = crawled_at or datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+        cursor = self.conn.execute(
+            "INSERT INTO documents (source, crawled_at, node_count, edge_count) VALUES (?, ?, ?, ?)",
+            (source, crawled_at, len(nodes), len(edges))
+        )
+        document_id = cursor.lastrowid
+
+        self._insert_many(
+            "INSERT INTO nodes (document_id, node_id, kind, label, schema_type) VALUES (?, ?, ?, ?, ?)",
+            ((document_id, n[1], n[0], _text(n[2]), _text(n[3]) if len(n) > 3 else None) for n in nodes)
+        )
+        self._insert_many(
+            "INSERT INTO edges (document_id, source, target) VALUES (?, ?, ?)",
+            ((document_id, e[0], e[1]) for e in edges)
+        )
+        self._insert_many(
+            "INSERT INTO entities (document_id, entity_id, node_id, schema_type, properties) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ((document_id, entity_id, node_id, _text(schema_type), properties)
+             for entity_id, node_id, schema_type, properties in self._extract_entities(nodes, edges))
+        )
+
+        return document_id
+
+    def _insert_many(self, sql: str, rows: Iterable[Tuple]):
+        """Run executemany() in fixed-size batches to bound memory"""
+        rows = iter(rows)
+        while True:
+            batch = list(itertools.islice(rows, self.batch_size))
+            if not batch:
+                break
+            self.conn.executemany(sql, batch)
+
+    @staticmethod
+    def _extract_entities(nodes: List[Tuple], edges: List[Tuple]) -> Iterable[Tuple]:
+        """
+        Find entities with an @id and snapshot their properties
+
+        The snapshot holds the entity's name and every value below it, with
+        nested values qualified by their property path (e.g. 'offers.price: 10'),
+        so a change anywhere inside the entity shows up in entity_history().
+
+        Yields:
+            (entity_id, node_id, schema_type, properties_json) tuples
+        """
+        node_by_id = {n[1]: n for n in nodes}
+        children: Dict[str, List[str]] = {}
+        parent_of: Dict[str, str] = {}
+        for source, target in edges:
+            children.setdefault(source, []).append(target)
+            parent_of[target] = source
+
+        for node in nodes:
+            if len(node) < 4 or node[3] != "identifier" or not str(node[2]).startswith(ID_LABEL_PREFIX):
+                continue
+
+            entity_id = str(node[2])[len(ID_LABEL_PREFIX):]
+            owner = node_by_id.get(parent_of.get(node[1]))
+            owner_id = owner[1] if owner else None
+            schema_type = owner[3] if owner and owner[0] == "type" and len(owner) > 3 else None
+
+            properties = []
+            if owner and owner[0] == "type" and len(owner) > 3 and owner[2] != owner[3]:
+                properties.append(f"name: {owner[2]}")
+
+            # Walk the subtree iteratively; deeply nested documents would
+            # otherwise hit the recursion limit
+            stack = [(child, "") for child in reversed(children.get(owner_id, [])) if child != node[1]]
+            while stack:
+                child_id, prefix = stack.pop()
+                child = node_by_id.get(child_id)
+                if child is None:
+                    continue
+
+                grandchildren = children.get(child_id, [])
+                if child[0] == "type" and len(child) > 3:
+                    properties.append(f"{prefix}@type: {child[3]}")
+                    if child[2] != child[3]:
+                        properties.append(f"{prefix}name: {child[2]}")
+                elif grandchildren:
+                    prefix = f"{prefix}{child[2]}."
+                else:
+                    properties.append(f"{prefix}{child[2]}")
+                stack.extend((grandchild, prefix) for grandchild in reversed(grandchildren))
+
+            yield entity_id, owner_id, schema_type, json.dumps(sorted(properties))
+
+    def pages_using_type(self, schema_type: str, latest_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        Find pages whose schema contains a given type
+
+        Args:
+            schema_type: Schema.org type such as 'Product'
+            latest_only: Only consider the most recent crawl of each source
+
+        Returns:
+            List of {'document_id', 'source', 'crawled_at'} dictionaries
+        """
+        sql = """
+            SELECT DISTINCT d.id AS document_id, d.source, d.crawled_at
+            FROM nodes n JOIN documents d ON d.id = n.document_id
+            WHERE n.schema_type = ? AND n.kind = 'type'
+        """
+        if latest_only:
+            sql += """
+            AND d.crawled_at = (
+                SELECT MAX(crawled_at) FROM documents WHERE source = d.source
+            )
+            """
+        sql += " ORDER BY d.source, d.crawled_at"
+
+        return [dict(row) for row in self.conn.execute(sql, (schema_type,))]
+
+    def entity_history(self, entity_id: str) -> List[Dict[str, Any]]:
+        """
+        Show how an entity changed across crawls
+
+        Args:
+            entity_id: The entity's @id
+
+        Returns:
+            One dictionary per stored occurrence, oldest first, with 'source',
+            'crawled_at', 'schema_type', 'properties', and the 'added' and
+            'removed' properties compared with the previous occurrence
+        """
+        rows = self.conn.execute(
+            """
+            SELECT d.id AS document_id, d.source, d.crawled_at, e.schema_type, e.properties
+            FROM entities e JOIN documents d ON d.id = e.document_id
+            WHERE e.entity_id = ?
+            ORDER BY d.crawled_at, d.id
+            """,
+            (entity_id,)
+        )
+
+        history = []
+        previous: List[str] = []
+        for row in rows:
+            properties = json.loads(row["properties"])
+            history.append({
+                "document_id": row["document_id"],
+                "source": row["source"],
+                "crawled_at": row["crawled_at"],
+                "schema_type": row["schema_type"],
+                "properties": properties,
+                "added": sorted(set(properties) - set(previous)),
+                "removed": sorted(set(previous) - set(properties))
+            })
+            previous = properties
+
+        return history
+
+    def latest_document(self, source: str) -> Optional[int]:
+        """Get the ID of the most recent crawl of a source, if any"""
+        row = self.conn.execute(
+            "SELECT id FROM documents WHERE source = ? ORDER BY crawled_at DESC, id DESC LIMIT 1",
+            (source,)
+        ).fetchone()
+        return row["id"] if row else None
+
+    def load_graph(self, document_id: int) -> Dict[str, Any]:
+        """
+        Load a stored graph in SchemaParser.parse() result format
+
+        Args:
+            document_id: ID returned by add_graph()
+
+        Returns:
+            Dictionary with 'nodes', 'edges', 'valid' and optionally 'error',
+            ready to pass to SchemaVisualizer.create_visualization()
+        """
+        if self.conn.execute("SELECT 1 FROM documents WHERE id = ?", (document_id,)).fetchone() is None:
+            return {
+                "error": f"Document not found: {document_id}",
+                "valid": False
+            }
+
+        nodes = [
+            (row["kind"], row["node_id"], row["label"], row["schema_type"])
+            for row in self.conn.execute(
+                "SELECT kind, node_id, label, schema_type FROM nodes WHERE document_id = ? ORDER BY rowid",
+                (document_id,)
+            )
+        ]
+        edges = [
+            (row["source"], row["target"])
+            for row in self.conn.execute(
+                "SELECT source, target FROM edges WHERE document_id = ? ORDER BY rowid",
+                (document_id,)
+            )
+        ]
+
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "valid": True
+        }
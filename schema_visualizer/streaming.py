@@ -0,0 +1,189 @@
+"""
+Incremental JSON scanning over bytes or memory-mapped files
+"""
+
+import json
+import mmap
+import re
+from typing import Any, Callable, Iterator, Optional, Tuple, Union
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR = re.compile(rb'[^,\]}\s]+')
+# Everything up to the next bracket, with whole strings skipped in one step
+_TO_BRACKET = re.compile(rb'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.DOTALL)
+
+_QUOTE = ord('"')
+_OPEN = (ord('['), ord('{'))
+
+
+def _error(message: str, pos: int) -> json.JSONDecodeError:
+    # JSONDecodeError wants a str document; only the position matters for the message
+    return json.JSONDecodeError(message, "", pos)
+
+
+def skip_whitespace(buf: Buffer, pos: int) -> int:
+    """Return the position of the next non-whitespace byte"""
+    return _WHITESPACE.match(buf, pos).end()
+
+
+def value_end(buf: Buffer, pos: int) -> int:
+    """
+    Find where the JSON value starting at pos ends
+
+    Strings are skipped as a whole, so brackets inside them are ignored.
+
+    Returns:
+        Position just past the value
+    """
+    if pos >= len(buf):
+        raise _error("Expecting value", pos)
+
+    first = buf[pos]
+    if first == _QUOTE:
+        match = _STRING.match(buf, pos)
+        if not match:
+            raise _error("Unterminated string starting at", pos)
+        return match.end()
+
+    if first not in _OPEN:
+        match = _SCALAR.match(buf, pos)
+        if not match:
+            raise _error("Expecting value", pos)
+        return match.end()
+
+    depth = 0
+    cursor = pos
+    size = len(buf)
+    while True:
+        cursor = _TO_BRACKET.match(buf, cursor).end()
+        if cursor >= size:
+            raise _error("Unterminated container starting at", pos)
+        char = buf[cursor]
+        if char == _QUOTE:
+            raise _error("Unterminated string starting at", cursor)
+        depth += 1 if char in _OPEN else -1
+        cursor += 1
+        if depth == 0:
+            return cursor
+
+
+def iter_array_items(buf: Buffer, pos: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) byte spans of the items of the array starting at pos
+    """
+    if buf[pos] != ord('['):
+        raise _error("Expecting '['", pos)
+
+    pos = skip_whitespace(buf, pos + 1)
+    if pos < len(buf) and buf[pos] == ord(']'):
+        return
+
+    while True:
+        end = value_end(buf, pos)
+        yield pos, end
+
+        pos = skip_whitespace(buf, end)
+        if pos >= len(buf):
+            raise _error("Expecting ',' delimiter", pos)
+        if buf[pos] == ord(']'):
+            return
+        if buf[pos] != ord(','):
+            raise _error("Expecting ',' delimiter", pos)
+        pos = skip_whitespace(buf, pos + 1)
+
+
+def iter_object_members(buf: Buffer, pos: int,
+                        find_end: Optional[Callable[[str, int], int]] = None) -> Iterator[Tuple[str, int, int]]:
+    """
+    Yield (key, value_start, value_end) for the members of the object starting at pos
+
+    Args:
+        buf: Document bytes or memory map
+        pos: Position of the opening brace
+        find_end: Optional function (key, value_start) -> value_end used
+            instead of scanning each value, e.g. to locate a huge member faster
+    """
+    if buf[pos] != ord('{'):
+        raise _error("Expecting '{'", pos)
+
+    pos = skip_whitespace(buf, pos + 1)
+    if pos < len(buf) and buf[pos] == ord('}'):
+        return
+
+    while True:
+        if buf[pos] != _QUOTE:
+            raise _error("Expecting property name enclosed in double quotes", pos)
+        key_end = value_end(buf, pos)
+        key = json.loads(bytes(buf[pos:key_end]))
+
+        pos = skip_whitespace(buf, key_end)
+        if pos >= len(buf) or buf[pos] != ord(':'):
+            raise _error("Expecting ':' delimiter", pos)
+        pos = skip_whitespace(buf, pos + 1)
+
+        end = find_end(key, pos) if find_end else value_end(buf, pos)
+        yield key, pos, end
+
+        pos = skip_whitespace(buf, end)
+        if pos >= len(buf):
+            raise _error("Expecting ',' delimiter", pos)
+        if buf[pos] == ord('}'):
+            return
+        if buf[pos] != ord(','):
+            raise _error("Expecting ',' delimiter", pos)
+        pos = skip_whitespace(buf, pos + 1)
+
+
+class LazyJsonArray(list):
+    """
+    A JSON array whose items are decoded only while it is iterated
+
+    Behaves like an (empty) list for isinstance checks, so SchemaParser walks
+    it like any other array while holding at most one decoded item at a time.
+    """
+
+    def __init__(self, buf: Buffer, start: int, decode: Callable[[bytes], Any] = json.loads):
+        super().__init__()
+        self.buf = buf
+        self.start = start
+        self.decode = decode
+
+    def __iter__(self):
+        for item_start, item_end in iter_array_items(self.buf, self.start):
+            yield self.decode(self.buf[item_start:item_end])
+
+    def __len__(self):
+        return sum(1 for _ in iter_array_items(self.buf, self.start))
+
+
+def load_lazy(buf: Buffer, decode: Callable[[bytes], Any] = json.loads):
+    """
+    Decode a document, deferring its large top-level arrays
+
+    A top-level array becomes a LazyJsonArray. For a top-level object, the
+    '@graph' array (if any) is deferred and all other members are decoded.
+
+    Args:
+        buf: Document bytes or memory map
+        decode: Function decoding one JSON value from bytes
+    """
+    pos = skip_whitespace(buf, 3 if buf[:3] == b'\xef\xbb\xbf' else 0)
+    if pos >= len(buf):
+        raise _error("Expecting value", pos)
+
+    if buf[pos] == ord('['):
+        return LazyJsonArray(buf, pos, decode)
+
+    if buf[pos] != ord('{'):
+        return decode(buf[pos:])
+
+    data = {}
+    for key, start, end in iter_object_members(buf, pos):
+        if key == "@graph" and buf[start] == ord('['):
+            data[key] = LazyJsonArray(buf, start, decode)
+        else:
+            data[key] = decode(buf[start:end])
+    return data
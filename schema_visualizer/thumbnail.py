@@ -0,0 +1,204 @@
+"""
+Static SVG/PNG thumbnails of schema graphs, rendered without a browser
+"""
+
+import io
+import os
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from .budget import DegradationReport, GraphBudget, degrade_graph
+from .config import VisualizerConfig
+from .layout import compute_layout
+from .output import write_if_changed
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:  # PNG thumbnails are optional
+    Image = None
+
+THUMBNAIL_FORMATS = ("svg", "png")
+
+# Small graphs are not enlarged beyond their on-screen size
+_MAX_SCALE = 1.0
+_MIN_RADIUS = 1.0
+
+
+def check_format(thumbnail_format: str):
+    """
+    Make sure a thumbnail format can be rendered
+
+    Raises:
+        ValueError: If the format is unknown, or is PNG without Pillow installed
+    """
+    if thumbnail_format not in THUMBNAIL_FORMATS:
+        raise ValueError(f"Unknown thumbnail format: {thumbnail_format}")
+    if thumbnail_format == "png" and Image is None:
+        raise ValueError("PNG thumbnails need Pillow (pip install Pillow)")
+
+
+class ThumbnailRenderer:
+    """Render graphs as small static images with the VisualizerConfig layouts and colors"""
+
+    def __init__(self, layout: str = "force_directed", theme: str = "dark", width: int = 320,
+                 height: int = 240, padding: int = 12, iterations: int = 25, labels: bool = False,
+                 budget: Optional[GraphBudget] = None):
+        """
+        Initialize renderer
+
+        Args:
+            layout: Layout type ('force_directed', 'hierarchical', 'circular')
+            theme: Color theme ('dark', 'light', 'blue')
+            width: Image width in pixels
+            height: Image height in pixels
+            padding: Margin around the graph in pixels
+            iterations: Force-directed layout steps; fewer than the
+                interactive page uses, which is invisible at thumbnail size
+            labels: Draw the labels of type nodes
+            budget: Optional GraphBudget limiting the nodes drawn
+        """
+        self.layout = layout
+        self.theme = theme
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.iterations = iterations
+        self.labels = labels
+        self.budget = budget
+        self.config = VisualizerConfig()
+        self.report = DegradationReport()
+
+    def geometry(self, nodes: List[Tuple], edges: List[Tuple]) -> Tuple[List, List, List]:
+        """
+        Lay out a graph and fit it into the image
+
+        Returns:
+            Tuple of (lines as (x1, y1, x2, y2), circles as (x, y, radius, color),
+            labels as (x, y, text)), in pixels. If a budget forced a simplified
+            graph, details are left in self.report.
+        """
+        self.report = DegradationReport()
+        if self.budget is not None:
+            nodes, edges = degrade_graph(nodes, edges, self.budget, self.report)
+
+        positions = compute_layout(nodes, edges, self.layout, self.iterations)
+        if not positions:
+            return [], [], []
+
+        xs = [x for x, _ in positions.values()]
+        ys = [y for _, y in positions.values()]
+        scale = min(
+            (self.width - 2 * self.padding) / ((max(xs) - min(xs)) or 1),
+            (self.height - 2 * self.padding) / ((max(ys) - min(ys)) or 1),
+            _MAX_SCALE
+        )
+
+        # Layouts are centred on the origin
+        mid_x, mid_y = self.width / 2, self.height / 2
+        points = {
+            node_id: (mid_x + x * scale, mid_y + y * scale)
+            for node_id, (x, y) in positions.items()
+        }
+
+        lines = [
+            points[source] + points[target]
+            for source, target in edges
+            if source in points and target in points
+        ]
+
+        circles = []
+        labels = []
+        for node in nodes:
+            if node[1] not in points:
+                continue
+            x, y = points[node[1]]
+            style = self.config.get_style_for_node(node)
+            radius = max(style["size"] * scale, _MIN_RADIUS)
+            circles.append((x, y, radius, style["color"]))
+            if self.labels and node[0] == "type":
+                labels.append((x, y + radius, str(node[2])))
+
+        return lines, circles, labels
+
+    def render_svg(self, nodes: List[Tuple], edges: List[Tuple]) -> str:
+        """Render a graph as an SVG document"""
+        lines, circles, labels = self.geometry(nodes, edges)
+        theme = self.config.THEMES.get(self.theme, self.config.THEMES["dark"])
+        width, height = self.width, self.height
+
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">',
+            f'<rect width="{width}" height="{height}" fill="{theme["bgcolor"]}"/>'
+        ]
+
+        # All edges share one path, and all nodes of a color share one path of
+        # circular arcs, so the document stays small for large graphs
+        if lines:
+            path = "".join(["M%.1f %.1fL%.1f %.1f" % line for line in lines])
+            parts.append(
+                f'<path d="{path}" stroke="{theme["edge_color"]}" stroke-width="0.6" '
+                f'stroke-opacity="0.6" fill="none"/>'
+            )
+
+        by_color: Dict[str, List[str]] = {}
+        for x, y, radius, color in circles:
+            by_color.setdefault(color, []).append(
+                "M%.1f %.1fa%.1f %.1f 0 1 0 %.1f 0a%.1f %.1f 0 1 0 %.1f 0"
+                % (x - radius, y, radius, radius, 2 * radius, radius, radius, -2 * radius)
+            )
+        for color, arcs in by_color.items():
+            parts.append(f'<path d="{"".join(arcs)}" fill="{color}"/>')
+
+        if labels:
+            parts.append(
+                f'<g font-family="sans-serif" font-size="8" text-anchor="middle" '
+                f'fill="{theme["font_color"]}">'
+            )
+            parts.extend(
+                '<text x="%.1f" y="%.1f">%s</text>' % (x, y + 8, escape(text))
+                for x, y, text in labels
+            )
+            parts.append('</g>')
+
+        parts.append('</svg>\n')
+        return "\n".join(parts)
+
+    def render_png(self, nodes: List[Tuple], edges: List[Tuple]) -> bytes:
+        """
+        Render a graph as PNG image bytes
+
+        Raises:
+            ValueError: If Pillow is not installed
+        """
+        check_format("png")
+
+        lines, circles, labels = self.geometry(nodes, edges)
+        theme = self.config.THEMES.get(self.theme, self.config.THEMES["dark"])
+
+        image = Image.new("RGB", (self.width, self.height), theme["bgcolor"])
+        draw = ImageDraw.Draw(image)
+
+        for line in lines:
+            draw.line(line, fill=theme["edge_color"], width=1)
+        for x, y, radius, color in circles:
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=color)
+        for x, y, text in labels:
+            draw.text((x, y + 1), text, fill=theme["font_color"], anchor="ma")
+
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def save(self, nodes: List[Tuple], edges: List[Tuple], output_file: str) -> bool:
+        """
+        Write a thumbnail; the format follows the extension ('.png' or '.svg')
+
+        Returns:
+            True if the file was written, False if its content was unchanged
+        """
+        if os.path.splitext(output_file)[1].lower() == ".png":
+            content = self.render_png(nodes, edges)
+        else:
+            content = self.render_svg(nodes, edges)
+        return write_if_changed(output_file, content)
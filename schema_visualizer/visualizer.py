@@ -5,14 +5,23 @@ Schema visualizer using PyVis for interactive graph visualization
 import os
 import webbrowser
 from pyvis.network import Network
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 from .config import VisualizerConfig
+from .assets import AssetBundle, copy_pyvis_lib
+from .budget import GraphBudget, DegradationReport, degrade_graph, LEVEL_STOP
+from .layout import compute_layout
+from .output import is_unchanged, write_atomic, write_if_changed
+
+# Marker the web interface uses to recognise exported graph artifacts
+GRAPH_ARTIFACT_FORMAT = "schema-visualizer-graph"
+GRAPH_ARTIFACT_VERSION = 1
 
 
 class SchemaVisualizer:
     """Create interactive visualizations of schema graphs"""
 
-    def __init__(self, layout="force_directed", theme="dark", width="100%", height="1000px"):
+    def __init__(self, layout="force_directed", theme="dark", width="100%", height="1000px",
+                 assets_dir=None, budget=None):
         """
         Initialize visualizer
 
@@ -21,12 +30,20 @@ class SchemaVisualizer:
             theme: Color theme ('dark', 'light', 'blue')
             width: Graph width
             height: Graph height
+            assets_dir: Shared directory for bundled vis-network/CSS assets.
+                When set, pages reference these files and need no network access.
+            budget: Optional GraphBudget limiting nodes and memory while rendering
         """
         self.layout = layout
         self.theme = theme
         self.width = width
         self.height = height
         self.config = VisualizerConfig()
+        self.assets = AssetBundle(assets_dir) if assets_dir else None
+        self.budget: Optional[GraphBudget] = budget
+        self.report = DegradationReport()
+        # Output files left untouched because their content had not changed
+        self.unchanged: List[str] = []
 
     def create_visualization(
         self,
@@ -45,8 +62,15 @@ class SchemaVisualizer:
             auto_open: Whether to auto-open the visualization in browser
 
         Returns:
-            Path to generated HTML file
+            Path to generated HTML file. If a budget forced a simplified graph,
+            details are left in self.report. The file is not rewritten when
+            its content is unchanged; it is then listed in self.unchanged.
         """
+        self.report = DegradationReport()
+        if self.budget is not None:
+            self.budget.start()
+            nodes, edges = degrade_graph(nodes, edges, self.budget, self.report)
+
         # Get theme settings
         theme_config = self.config.THEMES.get(self.theme, self.config.THEMES["dark"])
 
@@ -57,26 +81,25 @@ class SchemaVisualizer:
             width=self.width,
             bgcolor=theme_config["bgcolor"],
             font_color=theme_config["font_color"],
-            directed=True
+            directed=True,
+            cdn_resources="local"
         )
 
         # Apply layout settings
         self._apply_layout(net)
 
         # Add nodes
+        added = set()
         for node in nodes:
-            node_kind = node[0]
+            if self.budget is not None and self.budget.level(len(added), self.report) >= LEVEL_STOP:
+                self.report.skipped_nodes += len(nodes) - len(added)
+                break
+
             node_id = node[1]
             node_label = node[2]
 
             # Get node style based on type
-            if node_kind == "type" and len(node) > 3:
-                schema_type = node[3]
-                style = self.config.get_node_style(schema_type)
-            elif node_kind == "property":
-                style = self.config.get_property_style()
-            else:
-                style = self.config.get_node_style("type")
+            style = self.config.get_style_for_node(node)
 
             # Add node with styling
             net.add_node(
@@ -87,9 +110,14 @@ class SchemaVisualizer:
                 size=style["size"],
                 font={"color": theme_config["font_color"]}
             )
+            added.add(node_id)
 
         # Add edges
         for edge in edges:
+            if self.budget is not None and (edge[0] not in added or edge[1] not in added):
+                self.report.dropped_edges += 1
+                continue
+
             net.add_edge(
                 edge[0],
                 edge[1],
@@ -121,13 +149,23 @@ class SchemaVisualizer:
             }
             """)
 
-        # Save the graph
-        net.save_graph(output_file)
-
-        # Add custom styling to HTML
-        self._enhance_html(output_file)
-
-        print(f"\nVisualization saved to: {output_file}")
+        # Render in memory so unchanged pages can be left untouched
+        html_content = net.generate_html(notebook=False)
+        if self.assets:
+            # Point the page at the shared bundle instead of the CDN
+            self.assets.build(self.config.PAGE_STYLES)
+            html_content = self.assets.rewrite_html(html_content, output_file)
+        html_content = self._enhance_html_content(html_content, output_file).encode('utf-8')
+
+        if is_unchanged(output_file, html_content):
+            self.unchanged.append(output_file)
+            print(f"\nVisualization unchanged: {output_file}")
+        else:
+            if not self.assets:
+                # The page loads pyvis' local JS libraries from lib/ beside it
+                copy_pyvis_lib(os.path.dirname(os.path.abspath(output_file)))
+            write_atomic(output_file, html_content)
+            print(f"\nVisualization saved to: {output_file}")
 
         # Auto-open in browser
         if auto_open:
@@ -169,94 +207,91 @@ class SchemaVisualizer:
         else:
             return node_label
 
-    def _enhance_html(self, html_file: str):
-        """Add custom styling and controls to generated HTML"""
-        with open(html_file, 'r', encoding='utf-8') as f:
-            html_content = f.read()
+    def _enhance_html_content(self, html_content: str, html_file: str) -> str:
+        """Add custom styling and controls to generated HTML content"""
+        if self.assets:
+            # Reference the shared stylesheet instead of inlining it
+            page_styles = self.assets.page_style_tag(html_file)
+        else:
+            page_styles = f"<style>{self.config.PAGE_STYLES}</style>"
 
         # Add title and custom styling
         enhanced_html = html_content.replace(
             '</head>',
-            '''
-            <style>
-                body {
-                    margin: 0;
-                    padding: 0;
-                    font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-                }
-                .header {
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 20px;
-                    text-align: center;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }
-                .header h1 {
-                    margin: 0;
-                    font-size: 24px;
-                    font-weight: 600;
-                }
-                .header p {
-                    margin: 5px 0 0 0;
-                    font-size: 14px;
-                    opacity: 0.9;
-                }
-                .controls {
-                    background: #f8f9fa;
-                    padding: 10px 20px;
-                    border-bottom: 1px solid #dee2e6;
-                    font-size: 12px;
-                    color: #495057;
-                }
-                #mynetwork {
-                    width: 100%;
-                    height: calc(100vh - 120px);
-                }
-            </style>
-            <title>Schema Visualization - MapPackSEO Toolbox</title>
+            f"""
+            {page_styles}
+            <title>{self.config.PAGE_TITLE}</title>
             </head>
-            '''
+            """
         )
 
         # Add header
         enhanced_html = enhanced_html.replace(
             '<body>',
-            '''<body>
-            <div class="header">
-                <h1>Schema Markup Visualizer</h1>
-                <p>Interactive visualization of Schema.org structured data</p>
-            </div>
-            <div class="controls">
-                Use mouse to drag nodes • Scroll to zoom • Click nodes for details
-            </div>
-            '''
+            f"<body>{self.config.PAGE_HEADER}"
         )
 
-        with open(html_file, 'w', encoding='utf-8') as f:
-            f.write(enhanced_html)
+        return enhanced_html
 
-    def export_json(self, nodes: List[Tuple], edges: List[Tuple], output_file: str):
-        """Export graph data as JSON"""
+    def export_json(self, nodes: List[Tuple], edges: List[Tuple], output_file: str,
+                    include_layout: bool = False):
+        """
+        Export graph data as JSON
+
+        The file doubles as a graph artifact for the web interface, which
+        loads it directly instead of re-parsing the schema.
+
+        Args:
+            nodes: List of node tuples (type, id, label, schema_type)
+            edges: List of edge tuples (source, target)
+            output_file: Output JSON file path
+            include_layout: Precompute node positions ('x', 'y') with this
+                visualizer's layout, so the browser can skip its own layout
+
+        The file is not rewritten when its content is unchanged; it is then
+        listed in self.unchanged.
+        """
         import json
 
+        positions = compute_layout(nodes, edges, self.layout) if include_layout else {}
+
+        def node_data(node):
+            style = self.config.get_style_for_node(node)
+            data = {
+                "id": node[1],
+                "label": node[2],
+                "type": node[0],
+                "schema_type": node[3] if len(node) > 3 else None,
+                "color": style["color"],
+                "size": style["size"],
+                "title": self._create_tooltip(node)
+            }
+            if node[1] in positions:
+                data["x"], data["y"] = (round(v, 1) for v in positions[node[1]])
+            return data
+
+        # 'format' comes first so readers can recognise an artifact from its first bytes
         graph_data = {
-            "nodes": [
-                {
-                    "id": node[1],
-                    "label": node[2],
-                    "type": node[0],
-                    "schema_type": node[3] if len(node) > 3 else None
-                }
-                for node in nodes
-            ],
+            "format": GRAPH_ARTIFACT_FORMAT,
+            "version": GRAPH_ARTIFACT_VERSION,
+            "layout": self.layout,
+            "positions": include_layout,
+            "nodes": [node_data(node) for node in nodes],
             "edges": [
                 {"source": edge[0], "target": edge[1]}
                 for edge in edges
             ]
         }
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(graph_data, f, indent=2)
+        if include_layout:
+            # Layout artifacts are meant for large graphs; keep them compact
+            content = json.dumps(graph_data, separators=(',', ':'))
+        else:
+            content = json.dumps(graph_data, indent=2)
 
-        print(f"Graph data exported to: {output_file}")
+        if write_if_changed(output_file, content):
+            print(f"Graph data exported to: {output_file}")
+        else:
+            self.unchanged.append(output_file)
+            print(f"Graph data unchanged: {output_file}")
         return output_file
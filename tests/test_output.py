@@ -0,0 +1,27 @@
+"""
+Tests for skip-unchanged output writes
+"""
+
+import os
+
+from schema_visualizer.output import write_if_changed
+
+
+def test_write_if_changed_skips_identical_content(tmp_path):
+    path = str(tmp_path / "graph.json")
+
+    assert write_if_changed(path, '{"nodes": []}')
+    os.utime(path, (0, 0))
+
+    assert not write_if_changed(path, b'{"nodes": []}')
+    assert os.path.getmtime(path) == 0
+
+
+def test_write_if_changed_rewrites_new_content(tmp_path):
+    path = str(tmp_path / "graph.json")
+    write_if_changed(path, '{"nodes": []}')
+
+    assert write_if_changed(path, '{"nodes": [1]}')
+    with open(path) as f:
+        assert f.read() == '{"nodes": [1]}'
+    assert os.listdir(str(tmp_path)) == ["graph.json"]
@@ -0,0 +1,73 @@
+"""
+Tests that sharded parsing reproduces a serial parse
+"""
+
+import json
+
+import pytest
+
+from schema_visualizer.parser import SchemaParser
+from schema_visualizer.sharding import ShardedSchemaParser
+
+# Brackets, braces, quotes and backslashes inside strings must not move shard boundaries
+_AWKWARD = ['a]b', 'c}d', 'say "hi"', 'back\\', '\\"],{', '[{', ',', 'ü€']
+
+
+def _items(count):
+    return [
+        {
+            "@type": "Product",
+            "@id": f"p{index}",
+            "name": _AWKWARD[index % len(_AWKWARD)],
+            "tags": [_AWKWARD[(index + 3) % len(_AWKWARD)], {"nested": [1, {"end": "]}"}]}],
+            "offers": {"@type": "Offer", "price": index}
+        }
+        for index in range(count)
+    ]
+
+
+def _sharded(path):
+    return ShardedSchemaParser(workers=2, shards_per_worker=8).parse(str(path))
+
+
+@pytest.mark.parametrize("document", [
+    _items(200),
+    {"@context": "https://schema.org", "@type": "WebSite", "@graph": _items(200)},
+    {"@context": "https://schema.org", "@graph": _items(50), "about": {"@type": "Thing"}},
+])
+def test_sharded_parse_matches_serial(tmp_path, document):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(document, indent=1, ensure_ascii=False), encoding="utf-8")
+
+    serial = SchemaParser().parse(str(path))
+    sharded = _sharded(path)
+
+    assert sharded["valid"]
+    assert sharded["nodes"] == serial["nodes"]
+    assert sharded["edges"] == serial["edges"]
+
+
+def test_json_lines_match_serial_array(tmp_path):
+    items = _items(200)
+    lines = tmp_path / "schema.jsonl"
+    lines.write_text("".join(json.dumps(item) + "\n" for item in items), encoding="utf-8")
+    array = tmp_path / "schema.json"
+    array.write_text(json.dumps(items), encoding="utf-8")
+
+    serial = SchemaParser().parse(str(array))
+    sharded = _sharded(lines)
+
+    assert sharded["nodes"] == serial["nodes"]
+    assert sharded["edges"] == serial["edges"]
+
+
+def test_decode_error_matches_serial(tmp_path):
+    text = json.dumps(_items(200), indent=1)
+    path = tmp_path / "schema.json"
+    path.write_text(text[:len(text) // 2] + text[len(text) // 2:].replace('"price": ', '"price": --', 1))
+
+    serial = SchemaParser().parse(str(path))
+    sharded = _sharded(path)
+
+    assert not sharded["valid"]
+    assert sharded["error"] == serial["error"]
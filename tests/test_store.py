@@ -0,0 +1,58 @@
+"""
+Tests for the SQLite graph store
+"""
+
+import json
+
+from schema_visualizer.parser import SchemaParser
+from schema_visualizer.store import GraphStore
+
+
+def _product(price):
+    return json.dumps({
+        "@context": "https://schema.org",
+        "@graph": [{
+            "@type": "Product",
+            "@id": "https://example.com/#widget",
+            "name": "Widget",
+            "offers": {"@type": "Offer", "price": price}
+        }]
+    })
+
+
+def test_graph_round_trip(tmp_path):
+    result = SchemaParser().parse(_product(10))
+
+    with GraphStore(str(tmp_path / "graphs.db")) as store:
+        document_id = store.add_graph(result["nodes"], result["edges"], "https://example.com/")
+        loaded = store.load_graph(document_id)
+
+    assert loaded["valid"]
+    assert loaded["nodes"] == result["nodes"]
+    assert loaded["edges"] == result["edges"]
+
+
+def test_entity_history_reports_nested_changes(tmp_path):
+    with GraphStore(str(tmp_path / "graphs.db")) as store:
+        for crawled_at, price in (("2024-01-01T00:00:00+00:00", 10), ("2024-02-01T00:00:00+00:00", 12)):
+            result = SchemaParser().parse(_product(price))
+            store.add_graph(result["nodes"], result["edges"], "https://example.com/", crawled_at)
+
+        history = store.entity_history("https://example.com/#widget")
+
+    assert [entry["schema_type"] for entry in history] == ["Product", "Product"]
+    assert "name: Widget" in history[0]["properties"]
+    assert history[1]["added"] == ["offers.price: 12"]
+    assert history[1]["removed"] == ["offers.price: 10"]
+
+
+def test_list_valued_name_is_stored_as_text(tmp_path):
+    result = SchemaParser().parse('{"@type": "Thing", "@id": "t1", "name": ["a", "b"]}')
+
+    with GraphStore(str(tmp_path / "graphs.db")) as store:
+        document_id = store.add_graph(result["nodes"], result["edges"], "https://example.com/")
+        loaded = store.load_graph(document_id)
+        history = store.entity_history("t1")
+
+    assert loaded["nodes"][0][2] == '["a", "b"]'
+    assert history[0]["schema_type"] == "Thing"